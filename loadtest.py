@@ -0,0 +1,314 @@
+"""Local load generator for the Wood Calculator API.
+
+Starts the API with uvicorn on a local port (or targets --url), replays a
+weighted mix of calculate and export requests, and reports throughput plus
+p50/p95/p99 latency and error rates per route.
+
+Closed loop (fixed concurrency):
+    poetry run python loadtest.py --concurrency 16 --duration 30
+
+Open loop (fixed arrival rate, latency measured from the scheduled send time):
+    poetry run python loadtest.py --rate 200 --duration 30
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+from tabulate import tabulate
+
+ROUTES = {
+    "calculate": "/api/calculate",
+    "purchase-order": "/api/export/purchase-order",
+    "arrangements": "/api/export/arrangements",
+    "waste-analysis": "/api/export/waste-analysis",
+    "cutting-plan": "/api/export/cutting-plan",
+}
+
+DEFAULT_MIX = (
+    "calculate=4,purchase-order=1,arrangements=1,waste-analysis=1,cutting-plan=1"
+)
+
+SAMPLE_REQUEST = {
+    "pieces": [
+        {"type": "pine 2x10", "length": 30, "count": 110},
+        {"type": "pine 2x10", "length": 10, "count": 110},
+        {"type": "pine 2x15", "length": 30, "count": 55},
+    ],
+    "settings": {
+        "wood_types": {
+            "pine 2x15": {"unit_length": 480, "price": 60},
+            "pine 2x10": {"unit_length": 480, "price": 50},
+        },
+        "saw_width": 0.3,
+        "currency": " ILS",
+    },
+}
+
+
+class RouteStats:
+    """Latencies and errors recorded for one route."""
+
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.errors = 0
+
+    def record(self, latency: float, ok: bool) -> None:
+        self.latencies.append(latency)
+        if not ok:
+            self.errors += 1
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse a route mix like ``calculate=4,cutting-plan=1``."""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ROUTES:
+            raise argparse.ArgumentTypeError(
+                f"Unknown route '{name}', choose from: {', '.join(ROUTES)}"
+            )
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    index = max(
+        0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1)
+    )
+    return sorted_values[index]
+
+
+def free_port() -> int:
+    """Ask the OS for a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workers: int, plan_store: str) -> subprocess.Popen:
+    """Launch the API with uvicorn and wait until the health check answers.
+
+    An empty ``plan_store`` disables the store, so every calculate request
+    is solved rather than answered from a stored plan.
+    """
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "woodcut_planner.api:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        env={**os.environ, "WOODCUT_PLAN_STORE": plan_store},
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("uvicorn exited before the API came up")
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/api/health", timeout=1)
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("API did not come up within 30 seconds")
+
+
+async def send(
+    client: httpx.AsyncClient,
+    route: str,
+    body: bytes,
+    stats: Dict[str, RouteStats],
+    started: Optional[float] = None,
+) -> None:
+    """Send one request and record its latency and outcome."""
+    started = time.perf_counter() if started is None else started
+    try:
+        response = await client.post(
+            ROUTES[route], content=body, headers={"Content-Type": "application/json"}
+        )
+        ok = response.status_code < 400
+    except httpx.HTTPError:
+        ok = False
+    stats[route].record(time.perf_counter() - started, ok)
+
+
+async def run_closed_loop(
+    client: httpx.AsyncClient,
+    mix: Dict[str, float],
+    body: bytes,
+    stats: Dict[str, RouteStats],
+    concurrency: int,
+    duration: float,
+) -> None:
+    """Keep ``concurrency`` requests in flight until the duration is up."""
+    end = time.perf_counter() + duration
+    routes, weights = list(mix), list(mix.values())
+
+    async def worker() -> None:
+        while time.perf_counter() < end:
+            await send(client, random.choices(routes, weights)[0], body, stats)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def run_open_loop(
+    client: httpx.AsyncClient,
+    mix: Dict[str, float],
+    body: bytes,
+    stats: Dict[str, RouteStats],
+    rate: float,
+    duration: float,
+) -> None:
+    """Start requests at a fixed rate, whether or not earlier ones finished."""
+    start = time.perf_counter()
+    routes, weights = list(mix), list(mix.values())
+    tasks = []
+    for i in range(int(rate * duration)):
+        scheduled = start + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        route = random.choices(routes, weights)[0]
+        tasks.append(asyncio.create_task(send(client, route, body, stats, scheduled)))
+    await asyncio.gather(*tasks)
+
+
+async def run(args: argparse.Namespace, base_url: str, body: bytes) -> None:
+    """Warm up, run the load and print the report."""
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    timeout = httpx.Timeout(args.timeout)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=timeout
+    ) as client:
+        if args.warmup > 0:
+            warmup_stats = {route: RouteStats() for route in args.mix}
+            await run_closed_loop(
+                client, args.mix, body, warmup_stats, args.concurrency, args.warmup
+            )
+
+        stats = {route: RouteStats() for route in args.mix}
+        started = time.perf_counter()
+        if args.rate:
+            await run_open_loop(client, args.mix, body, stats, args.rate, args.duration)
+        else:
+            await run_closed_loop(
+                client, args.mix, body, stats, args.concurrency, args.duration
+            )
+        elapsed = time.perf_counter() - started
+
+    print_report(stats, elapsed)
+
+
+def print_report(stats: Dict[str, RouteStats], elapsed: float) -> None:
+    """Print throughput, latency percentiles and error rates per route."""
+    rows = []
+    all_latencies: List[float] = []
+    total_errors = 0
+    for route, route_stats in stats.items():
+        latencies = sorted(route_stats.latencies)
+        all_latencies.extend(latencies)
+        total_errors += route_stats.errors
+        rows.append(summary_row(route, latencies, route_stats.errors, elapsed))
+    rows.append(summary_row("all", sorted(all_latencies), total_errors, elapsed))
+
+    headers = ["Route", "Requests", "Req/s", "p50 ms", "p95 ms", "p99 ms", "Errors %"]
+    print(tabulate(rows, headers=headers, tablefmt="grid", floatfmt=".1f"))
+
+
+def summary_row(
+    route: str, latencies: List[float], errors: int, elapsed: float
+) -> List[object]:
+    """Summarize one route's sorted latencies."""
+    count = len(latencies)
+    return [
+        route,
+        count,
+        count / elapsed if elapsed else 0.0,
+        percentile(latencies, 0.50) * 1000,
+        percentile(latencies, 0.95) * 1000,
+        percentile(latencies, 0.99) * 1000,
+        errors / count * 100 if count else 0.0,
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Target a running API instead of starting one")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument(
+        "--request",
+        type=argparse.FileType(),
+        help="JSON request body to replay (defaults to a small sample order)",
+    )
+    parser.add_argument(
+        "--plan-store",
+        default="",
+        help="Plan store file for the started API (default: none, so the "
+        "replayed request is solved every time instead of read back)",
+    )
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=parse_mix(DEFAULT_MIX),
+        help=f"Weighted route mix (default: {DEFAULT_MIX})",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Requests in flight (closed loop)"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        help="Requests per second (open loop, overrides concurrency)",
+    )
+    parser.add_argument("--duration", type=float, default=10, help="Seconds of load")
+    parser.add_argument(
+        "--warmup", type=float, default=2, help="Seconds of unreported warm-up load"
+    )
+    parser.add_argument("--timeout", type=float, default=30, help="Request timeout")
+    parser.add_argument("--seed", type=int, help="Seed for the route mix")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    body = json.dumps(
+        json.load(args.request) if args.request else SAMPLE_REQUEST
+    ).encode()
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        port = free_port()
+        server = start_server(port, args.workers, args.plan_store)
+        base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        asyncio.run(run(args, base_url, body))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,14 @@
-from .models import WoodPiece, Settings, CalculationResult
+from .models import WoodPiece, SheetPiece, Settings, CalculationResult
 from .calculator import calculate_wood_arrangement
+from .sheet_calculator import calculate_sheet_arrangement
 from .cli import calculate
 
 __all__ = [
     "WoodPiece",
+    "SheetPiece",
     "Settings",
     "CalculationResult",
     "calculate_wood_arrangement",
+    "calculate_sheet_arrangement",
     "calculate",
 ]
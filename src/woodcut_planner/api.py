@@ -1,11 +1,54 @@
-from typing import List
-from fastapi import FastAPI, HTTPException
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+from concurrent.futures import ProcessPoolExecutor
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, model_validator
+import io
+import json
+import multiprocessing
 import os
+import time
 
-from .models import WoodPiece, Settings, CalculationResult
-from .calculator import calculate_wood_arrangement
+from .models import (
+    WoodPiece,
+    SheetPiece,
+    ColumnarPieces,
+    Project,
+    SettingsVariant,
+    SweepResult,
+    Settings,
+    CalculationResult,
+    ConsolidatedResult,
+)
+from .calculator import (
+    calculate_wood_arrangement,
+    calculate_grouped_arrangement,
+    group_pieces,
+    iter_improving_arrangements,
+)
+from .sheet_calculator import calculate_sheet_arrangement
+from .consolidation import calculate_consolidated_arrangement
+from .sweep import expand_grid, run_sweep
+from .online import DEFAULT_WINDOW, OnlinePacker
+from .plan_store import (
+    DEFAULT_MAX_AGE,
+    DEFAULT_MAX_PLANS,
+    PlanStore,
+    plan_id,
+    result_digest,
+)
+from .timing import ServerTimingMiddleware, phase
+from .columnar_exporter import FORMATS, SCHEMAS, generate_columns, write_table
 from .csv_exporter import (
     generate_purchase_order,
     generate_arrangements,
@@ -37,26 +80,361 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in Server-Timing header breaking each response down by phase
+if os.getenv("WOODCUT_SERVER_TIMING", "") not in ("", "0"):
+    app.add_middleware(ServerTimingMiddleware)
+
+# Calculated plans, keyed by the content hash of their request. The oldest
+# are dropped beyond a number of plans or an age in seconds.
+plan_store = PlanStore(
+    os.getenv("WOODCUT_PLAN_STORE", "plans.sqlite3"),
+    max_plans=int(os.getenv("WOODCUT_PLAN_STORE_MAX_PLANS", DEFAULT_MAX_PLANS)),
+    max_age=float(os.getenv("WOODCUT_PLAN_STORE_MAX_AGE", DEFAULT_MAX_AGE)),
+)
+
+# A stored plan and everything derived from it never change
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
 
 class CalculationRequest(BaseModel):
-    pieces: List[WoodPiece]
+    """Pieces as a list of objects or as columns, plus settings."""
+
+    pieces: Optional[List[WoodPiece]] = None
+    columns: Optional[ColumnarPieces] = None
     settings: Settings
 
+    @model_validator(mode="wrap")
+    @classmethod
+    def time_parsing(cls, data: Any, handler: Callable) -> "CalculationRequest":
+        with phase("parse"):
+            return handler(data)
+
+    @model_validator(mode="after")
+    def check_pieces(self) -> "CalculationRequest":
+        if (self.pieces is None) == (self.columns is None):
+            raise ValueError("Provide exactly one of pieces or columns")
+        return self
+
+
+def _calculate(request: CalculationRequest) -> CalculationResult:
+    """Run the calculator on either request format."""
+    try:
+        if request.columns is not None:
+            return calculate_grouped_arrangement(
+                request.columns.to_piece_counts(), request.settings
+            )
+        return calculate_wood_arrangement(request.pieces, request.settings)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 
 @app.post("/api/calculate", response_model=CalculationResult)
-async def calculate(request: CalculationRequest) -> CalculationResult:
-    """Calculate optimal wood cutting arrangement."""
+async def calculate(request: CalculationRequest) -> Response:
+    """Calculate optimal wood cutting arrangement.
+
+    The plan is stored under the content hash of the request, returned as
+    ``plan_id``. Repeating a request returns the stored plan without
+    solving it again. The result is encoded once, for both the store and
+    the response.
+    """
+    with phase("store"):
+        request_data = request.model_dump(mode="json")
+        request_plan_id = plan_id(request_data)
+        stored = plan_store.get(request_plan_id)
+    if stored is not None:
+        return Response(content=stored[1], media_type="application/json")
+
+    result = _calculate(request)
+    result.plan_id = request_plan_id
+    with phase("encode"):
+        result_json = result.model_dump_json()
+    with phase("store"):
+        plan_store.put(request_plan_id, json.dumps(request_data), result_json)
+    return Response(content=result_json, media_type="application/json")
+
+
+def _stored_plan(plan_id: str) -> Tuple[str, str]:
+    """The stored request and result JSON of a plan, or a 404."""
+    stored = plan_store.get(plan_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail=f"Unknown plan: {plan_id}")
+    return stored
+
+
+def _plan_etag(plan_id: str, result_json: str, suffix: str = "") -> str:
+    """A strong ETag for a stored plan.
+
+    Plans can be evicted and solved again under the same id with a different
+    outcome, for instance when the improvement pass is time-bounded, so the
+    tag follows the stored result's bytes rather than the request alone.
+    """
+    return f'"{plan_id}.{result_digest(result_json)}{suffix}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header lists the ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+# Export name -> (filename, CSV generator from a stored plan)
+PLAN_EXPORTS: Dict[
+    str,
+    Tuple[str, Callable[[CalculationResult, CalculationRequest], List[List[str]]]],
+] = {
+    "purchase-order": (
+        "purchase_order.csv",
+        lambda result, request: generate_purchase_order(result, request.settings),
+    ),
+    "arrangements": (
+        "arrangements.csv",
+        lambda result, request: generate_arrangements(
+            result, request.pieces or [], request.settings
+        ),
+    ),
+    "waste-analysis": (
+        "waste_analysis.csv",
+        lambda result, request: generate_waste_analysis(result, request.settings),
+    ),
+    "cutting-plan": (
+        "cutting_plan.csv",
+        lambda result, request: generate_cutting_plan(result, request.settings),
+    ),
+}
+
+
+@app.get("/api/plans/{plan_id}", response_model=CalculationResult)
+async def get_plan(
+    plan_id: str, if_none_match: Optional[str] = Header(default=None)
+) -> Response:
+    """Fetch a stored plan, answering 304 when the client's copy is current."""
+    _, result_json = _stored_plan(plan_id)
+    etag = _plan_etag(plan_id, result_json)
+    headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=result_json, media_type="application/json", headers=headers)
+
+
+@app.get("/api/plans/{plan_id}/export/{kind}")
+async def export_plan(
+    plan_id: str, kind: str, if_none_match: Optional[str] = Header(default=None)
+) -> Response:
+    """Export a stored plan as CSV data, with a strong ETag for caching.
+
+    ``kind`` is purchase-order, arrangements, waste-analysis or
+    cutting-plan. The body matches the POST export endpoints.
+    """
+    if kind not in PLAN_EXPORTS:
+        raise HTTPException(status_code=404, detail=f"Unknown export: {kind}")
+    request_json, result_json = _stored_plan(plan_id)
+    etag = _plan_etag(plan_id, result_json, f"-{kind}")
+    headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    request = CalculationRequest.model_validate_json(request_json)
+    result = CalculationResult.model_validate_json(result_json)
+    filename, generate = PLAN_EXPORTS[kind]
+    return JSONResponse(
+        {"filename": filename, "data": generate(result, request)}, headers=headers
+    )
+
+
+class SheetCalculationRequest(BaseModel):
+    """Rectangular sheet pieces plus settings with sheet types."""
+
+    pieces: List[SheetPiece]
+    settings: Settings
+
+
+@app.post("/api/calculate/sheets", response_model=CalculationResult)
+async def calculate_sheets(request: SheetCalculationRequest) -> CalculationResult:
+    """Calculate a guillotine cutting arrangement for sheet goods."""
     try:
-        result = calculate_wood_arrangement(request.pieces, request.settings)
-        return result
+        return calculate_sheet_arrangement(request.pieces, request.settings)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+class ConsolidatedRequest(BaseModel):
+    """Several projects sharing one settings catalogue."""
+
+    projects: List[Project]
+    settings: Settings
+
+
+@app.post("/api/calculate/consolidated", response_model=ConsolidatedResult)
+async def calculate_consolidated(request: ConsolidatedRequest) -> ConsolidatedResult:
+    """Pack several projects together and attribute costs to each."""
+    try:
+        return calculate_consolidated_arrangement(request.projects, request.settings)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# Sweeps share one capped pool of spawned solver processes. Forking the
+# threaded server for every request can deadlock, and per-request pools
+# would oversubscribe the CPUs across concurrent sweeps.
+SWEEP_WORKERS = int(os.getenv("WOODCUT_SWEEP_WORKERS", min(4, os.cpu_count() or 1)))
+sweep_executor = (
+    ProcessPoolExecutor(
+        max_workers=SWEEP_WORKERS, mp_context=multiprocessing.get_context("spawn")
+    )
+    if SWEEP_WORKERS > 1
+    else None
+)
+
+
+class SweepRequest(CalculationRequest):
+    """A cut list, base settings and the variants to compare."""
+
+    variants: List[SettingsVariant] = []
+    grid: Dict[str, List[Any]] = {}
+
+
+@app.post("/api/sweep", response_model=SweepResult)
+def sweep(request: SweepRequest) -> SweepResult:
+    """Compare units, cost and waste of one cut list under settings variants.
+
+    Scenarios are the listed ``variants`` followed by every combination of
+    the ``grid`` values.
+    """
+    if request.columns is not None:
+        piece_counts = request.columns.to_piece_counts()
+    else:
+        piece_counts = group_pieces(request.pieces)
+    variants = request.variants + expand_grid(request.grid)
+    try:
+        return run_sweep(
+            piece_counts, request.settings, variants, workers=1, executor=sweep_executor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """Format one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/api/calculate/stream")
+async def calculate_stream(request: CalculationRequest) -> StreamingResponse:
+    """Stream improving arrangements as Server-Sent Events.
+
+    A quick first fit decreasing plan is sent first, followed by each strictly
+    better plan the optimizers find, as ``plan`` events. A final ``done`` event
+    repeats the summary of the best plan.
+    """
+    if request.columns is not None:
+        piece_counts = request.columns.to_piece_counts()
+    else:
+        piece_counts = group_pieces(request.pieces)
+    started = time.perf_counter()
+    plans = iter_improving_arrangements(piece_counts, request.settings)
+    try:
+        # Solve the first plan up front so bad input still gets a 400
+        first = next(plans)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def summary(stage: str, result: CalculationResult) -> dict:
+        return {
+            "stage": stage,
+            "units": sum(result.total_units.values()),
+            "total_cost": result.total_cost,
+            "waste": result.waste_statistics.total_waste,
+            "elapsed": time.perf_counter() - started,
+        }
+
+    def events() -> Iterator[str]:
+        stage, result = first
+        yield _sse_event(
+            "plan", {**summary(stage, result), "result": result.model_dump()}
+        )
+        for stage, result in plans:
+            yield _sse_event(
+                "plan", {**summary(stage, result), "result": result.model_dump()}
+            )
+        yield _sse_event("done", summary(stage, result))
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """A streaming response sent while the request body is still being read.
+
+    StreamingResponse watches ``receive`` for a disconnect, which would
+    swallow the body chunks the handler is still reading, so this one only
+    streams. A client that goes away ends the body, and with it the stream.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+
+
+async def _ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a streamed request body into lines as the bytes arrive."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode()
+    if buffer:
+        yield buffer.decode()
+
+
+@app.post("/api/pack/stream")
+async def pack_stream(
+    request: Request,
+    window: int = DEFAULT_WINDOW,
+    min_length: float = 0.0,
+) -> StreamingResponse:
+    """Pack an NDJSON stream of pieces online, streaming back finished boards.
+
+    The first line holds ``{"settings": {...}}``. Every following line is a
+    piece object or ``{"command": "flush"}``. Each finished board is sent as
+    an NDJSON ``board`` event as soon as it is known, so cutting can start
+    before the order is complete. The remaining units are flushed and a
+    ``summary`` event sent when the request body ends.
+    """
+    lines = _ndjson_lines(request.stream())
+    line_number = 0
+    try:
+        header = ""
+        while not header.strip():
+            header = await lines.__anext__()
+            line_number += 1
+        settings = Settings.model_validate(json.loads(header)["settings"])
+        packer = OnlinePacker(settings, window, min_length)
+    except StopAsyncIteration:
+        raise HTTPException(status_code=400, detail="Missing settings line")
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid settings line: {e}")
+
+    async def events() -> AsyncIterator[str]:
+        number = line_number
+        async for line in lines:
+            number += 1
+            for event in packer.handle_line(line, number):
+                yield json.dumps(event) + "\n"
+        for event in packer.finish():
+            yield json.dumps(event) + "\n"
+
+    return _DuplexStreamingResponse(events(), media_type="application/x-ndjson")
+
+
 @app.post("/api/export/purchase-order")
 async def export_purchase_order(request: CalculationRequest) -> dict:
     """Generate a CSV export of the purchase order."""
-    result = calculate_wood_arrangement(request.pieces, request.settings)
+    result = _calculate(request)
     csv_data = generate_purchase_order(result, request.settings)
     return {"filename": "purchase_order.csv", "data": csv_data}
 
@@ -64,15 +442,15 @@ async def export_purchase_order(request: CalculationRequest) -> dict:
 @app.post("/api/export/arrangements")
 async def export_arrangements(request: CalculationRequest) -> dict:
     """Generate a CSV export of the cutting arrangements."""
-    result = calculate_wood_arrangement(request.pieces, request.settings)
-    csv_data = generate_arrangements(result, request.pieces, request.settings)
+    result = _calculate(request)
+    csv_data = generate_arrangements(result, request.pieces or [], request.settings)
     return {"filename": "arrangements.csv", "data": csv_data}
 
 
 @app.post("/api/export/waste-analysis")
 async def export_waste_analysis(request: CalculationRequest) -> dict:
     """Generate a CSV export of the waste analysis."""
-    result = calculate_wood_arrangement(request.pieces, request.settings)
+    result = _calculate(request)
     csv_data = generate_waste_analysis(result, request.settings)
     return {"filename": "waste_analysis.csv", "data": csv_data}
 
@@ -80,11 +458,38 @@ async def export_waste_analysis(request: CalculationRequest) -> dict:
 @app.post("/api/export/cutting-plan")
 async def export_cutting_plan(request: CalculationRequest) -> dict:
     """Generate a CSV export of the aggregated cutting plan."""
-    result = calculate_wood_arrangement(request.pieces, request.settings)
+    result = _calculate(request)
     csv_data = generate_cutting_plan(result, request.settings)
     return {"filename": "cutting_plan.csv", "data": csv_data}
 
 
+@app.post("/api/export/columnar/{table}")
+async def export_columnar(
+    table: str, request: CalculationRequest, format: str = "parquet"
+) -> Response:
+    """Export one flat table of the result as Parquet or an Arrow IPC file.
+
+    ``table`` is one of units, placements, sheet_placements or waste.
+    """
+    if table not in SCHEMAS:
+        raise HTTPException(status_code=404, detail=f"Unknown table: {table}")
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format: {format}")
+    result = _calculate(request)
+    columns = generate_columns(result, request.settings)[table]
+    buffer = io.BytesIO()
+    try:
+        write_table(columns, table, buffer, format)
+    except ImportError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    suffix, media_type = FORMATS[format]
+    return Response(
+        content=buffer.getvalue(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{table}{suffix}"'},
+    )
+
+
 @app.get("/api/health")
 async def health_check() -> dict:
     """Health check endpoint."""
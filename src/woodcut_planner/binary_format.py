@@ -0,0 +1,193 @@
+"""Compact binary cut lists.
+
+Layout, all little-endian:
+
+- header: magic ``WCUT``, format version (u16), reserved (u16), number of
+  wood types (u32), offset of the first record (u64), number of records (u64)
+- wood type dictionary: per type, its UTF-8 name length (u16) and name
+- zero padding up to an 8-byte boundary
+- the records as three column blocks: every type id (u32), then every
+  count (u32), then every length (f64), so each block can be viewed as a
+  typed array in place
+
+Version 1 files, with interleaved ``(type id, count, length)`` records, are
+still read.
+"""
+
+import math
+import mmap
+import struct
+import sys
+from array import array
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple, Union
+
+from .calculator import PieceCounts
+
+SUFFIX = ".wcb"
+MAGIC = b"WCUT"
+VERSION = 2
+
+_HEADER = struct.Struct("<4sHHIQQ")
+_NAME_LENGTH = struct.Struct("<H")
+_V1_RECORD = struct.Struct("<IId")
+# Bytes per record across the three column blocks
+_RECORD_SIZE = 4 + 4 + 8
+
+# Columns of type ids, counts and lengths
+_Columns = Tuple[Sequence[int], Sequence[int], Sequence[float]]
+
+
+def write_binary_pieces(piece_counts: PieceCounts, path: Union[str, Path]) -> int:
+    """Write grouped pieces as a binary cut list, returning the record count."""
+    names = list(piece_counts)
+    dictionary = b"".join(
+        _NAME_LENGTH.pack(len(encoded)) + encoded
+        for encoded in (name.encode() for name in names)
+    )
+    records_offset = _HEADER.size + len(dictionary)
+    padding = -records_offset % 8
+    records_offset += padding
+
+    type_ids, counts, lengths = array("I"), array("I"), array("d")
+    for type_id, name in enumerate(names):
+        for length, count in piece_counts[name].items():
+            if count < 1:
+                raise ValueError(f"Count of {name} {length}cm must be at least 1")
+            type_ids.append(type_id)
+            counts.append(count)
+            lengths.append(length)
+    if sys.byteorder != "little":
+        for column in (type_ids, counts, lengths):
+            column.byteswap()
+    records = type_ids.tobytes() + counts.tobytes() + lengths.tobytes()
+
+    with open(path, "wb") as f:
+        f.write(
+            _HEADER.pack(
+                MAGIC,
+                VERSION,
+                0,
+                len(names),
+                records_offset,
+                len(lengths),
+            )
+        )
+        f.write(dictionary)
+        f.write(b"\0" * padding)
+        f.write(records)
+    return len(lengths)
+
+
+def read_binary_pieces(path: Union[str, Path]) -> PieceCounts:
+    """Read a binary cut list into the calculator's grouped pieces.
+
+    The file is memory-mapped, and on little-endian machines the three
+    record columns are typed views cast straight over the mapping, with no
+    copy and no parsing. They are checked with whole-column min and max
+    calls, and each record is touched once, to sum it into the grouped
+    pieces. Records with the same type and length are summed.
+    """
+    with open(path, "rb") as f:
+        if not f.seek(0, 2):
+            raise ValueError(f"{path}: empty file is not a binary cut list")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                return _read_view(view, path)
+            finally:
+                view.release()
+
+
+def _read_view(view: memoryview, path: Union[str, Path]) -> PieceCounts:
+    if len(view) < _HEADER.size:
+        raise ValueError(f"{path}: too short for a binary cut list header")
+    magic, version, _, type_count, records_offset, record_count = _HEADER.unpack_from(
+        view
+    )
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a binary cut list")
+    if version not in (1, VERSION):
+        raise ValueError(f"{path}: unsupported binary cut list version {version}")
+    record_size = _V1_RECORD.size if version == 1 else _RECORD_SIZE
+    records_end = records_offset + record_count * record_size
+    if records_end > len(view):
+        raise ValueError(f"{path}: truncated, expected {records_end} bytes")
+
+    names: List[str] = []
+    offset = _HEADER.size
+    for _ in range(type_count):
+        if offset + _NAME_LENGTH.size > records_offset:
+            raise ValueError(f"{path}: wood type dictionary overlaps the records")
+        (size,) = _NAME_LENGTH.unpack_from(view, offset)
+        offset += _NAME_LENGTH.size
+        if offset + size > records_offset:
+            raise ValueError(f"{path}: wood type dictionary overlaps the records")
+        names.append(bytes(view[offset : offset + size]).decode())
+        offset += size
+    if len(set(names)) < len(names):
+        raise ValueError(f"{path}: wood type dictionary lists a name twice")
+
+    records = view[records_offset:records_end]
+    if version == 1:
+        type_ids, counts, lengths = _v1_columns(records)
+    else:
+        type_ids, counts, lengths = _columns(records, record_count)
+    try:
+        return _group(names, type_ids, counts, lengths, path)
+    finally:
+        for column in (type_ids, counts, lengths):
+            if isinstance(column, memoryview):
+                column.release()
+        records.release()
+
+
+def _columns(records: memoryview, record_count: int) -> _Columns:
+    """The three record columns, cast in place when the byte order allows."""
+    blocks = (
+        records[: 4 * record_count],
+        records[4 * record_count : 8 * record_count],
+        records[8 * record_count :],
+    )
+    if sys.byteorder == "little":
+        return blocks[0].cast("I"), blocks[1].cast("I"), blocks[2].cast("d")
+    columns = (array("I", blocks[0]), array("I", blocks[1]), array("d", blocks[2]))
+    for column in columns:
+        column.byteswap()
+    return columns
+
+
+def _v1_columns(records: memoryview) -> _Columns:
+    type_ids, counts, lengths = array("I"), array("I"), array("d")
+    for type_id, count, length in _V1_RECORD.iter_unpack(records):
+        type_ids.append(type_id)
+        counts.append(count)
+        lengths.append(length)
+    return type_ids, counts, lengths
+
+
+def _group(
+    names: List[str],
+    type_ids: Sequence[int],
+    counts: Sequence[int],
+    lengths: Sequence[float],
+    path: Union[str, Path],
+) -> PieceCounts:
+    """Validate the record columns and sum them by type and length."""
+    if not len(type_ids):
+        return {}
+    if max(type_ids) >= len(names):
+        raise ValueError(f"{path}: record refers to unknown type id {max(type_ids)}")
+    if min(counts) < 1 or not all(map(math.isfinite, lengths)) or not min(lengths) > 0:
+        for type_id, count, length in zip(type_ids, counts, lengths):
+            if not (length > 0 and math.isfinite(length)) or count < 1:
+                raise ValueError(
+                    f"{path}: invalid {names[type_id]} piece "
+                    f"(length {length}, count {count})"
+                )
+
+    by_id: Dict[int, Dict[float, int]] = defaultdict(lambda: defaultdict(int))
+    for type_id, count, length in zip(type_ids, counts, lengths):
+        by_id[type_id][length] += count
+    return {names[type_id]: dict(lengths) for type_id, lengths in by_id.items()}
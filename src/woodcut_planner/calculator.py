@@ -1,5 +1,19 @@
-from typing import List, Dict, Tuple
-from collections import defaultdict
+import heapq
+import math
+import time
+from bisect import bisect_left, insort
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Dict,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from collections import Counter, defaultdict
 from itertools import combinations
 
 from .models import (
@@ -8,9 +22,41 @@ from .models import (
     CalculationResult,
     WoodUnit,
     WoodArrangement,
+    SheetArrangement,
     PiecePlacement,
     WasteStatistics,
+    TypeDiagnostics,
+    Diagnostics,
 )
+from .timing import phase
+
+# Wood type -> piece length -> number of pieces, the solver's input
+PieceCounts = Dict[str, Dict[float, int]]
+
+
+class _SolverCounters:
+    """Cheap counters the packing strategies bump when diagnostics are on."""
+
+    __slots__ = (
+        "fit_attempts",
+        "failed_fits",
+        "units_scanned",
+        "max_units_scanned",
+        "units_opened",
+    )
+
+    def __init__(self) -> None:
+        self.fit_attempts = 0
+        self.failed_fits = 0
+        self.units_scanned = 0
+        self.max_units_scanned = 0
+        self.units_opened = 0
+
+    def scanned(self, units: int) -> None:
+        """Record how many units were looked at to place one piece."""
+        self.units_scanned += units
+        if units > self.max_units_scanned:
+            self.max_units_scanned = units
 
 
 def _calculate_remaining_space(
@@ -32,9 +78,15 @@ def _calculate_remaining_space(
 
 
 def _try_add_piece(
-    piece: WoodPiece, unit: WoodUnit, unit_length: float, saw_width: float
+    piece: WoodPiece,
+    unit: WoodUnit,
+    unit_length: float,
+    saw_width: float,
+    counters: Optional[_SolverCounters] = None,
 ) -> bool:
     """Try to add a piece to a unit. Returns True if successful."""
+    if counters is not None:
+        counters.fit_attempts += 1
     # Calculate current position (end of last piece + saw width if needed)
     current_position = 0
     if unit.positions:
@@ -48,58 +100,363 @@ def _try_add_piece(
         unit.positions.append(
             PiecePlacement(length=piece.length, start_position=current_position)
         )
-        # Update waste
-        unit.waste = _calculate_remaining_space(unit, unit_length, saw_width)
+        # Update waste; an exact fit can come out a rounding error below zero
+        unit.waste = max(0.0, _calculate_remaining_space(unit, unit_length, saw_width))
         return True
 
+    if counters is not None:
+        counters.failed_fits += 1
     return False
 
 
 def _arrange_pieces(
-    pieces: List[WoodPiece], unit_length: float, saw_width: float
+    pieces: List[WoodPiece],
+    unit_length: float,
+    saw_width: float,
+    counters: Optional[_SolverCounters] = None,
 ) -> List[WoodUnit]:
     """Arrange pieces optimally, minimizing the number of units and waste."""
     # Sort pieces by length (longest first) for initial placement
     remaining_pieces = sorted(pieces, key=lambda p: (-p.length, p.type))
     units: List[WoodUnit] = []
-    current_unit_number = 1
+    # Units keyed by most remaining space for better filling. A piece that
+    # does not fit the emptiest unit fits none, so only the top is tried.
+    by_space: List[Tuple[float, int]] = []
 
-    while remaining_pieces:
+    for piece in remaining_pieces:
         # Try to fit piece in existing units first
-        piece = remaining_pieces[0]
-        piece_placed = False
-
-        # Sort units by most remaining space for better filling
-        for unit in sorted(units, key=lambda u: u.waste, reverse=True):
-            if _try_add_piece(piece, unit, unit_length, saw_width):
-                remaining_pieces.pop(0)
-                piece_placed = True
-                break
-
-        if not piece_placed:
-            # Create new unit
-            new_unit = WoodUnit(
-                unit_number=current_unit_number,
-                pieces={},
-                positions=[],
-                waste=unit_length,
-            )
+        if by_space:
+            if counters is not None:
+                counters.scanned(1)
+            index = by_space[0][1]
+            unit = units[index]
+            if _try_add_piece(piece, unit, unit_length, saw_width, counters):
+                heapq.heapreplace(by_space, (-unit.waste, index))
+                continue
+
+        # Create new unit
+        new_unit = WoodUnit(
+            unit_number=len(units) + 1,
+            pieces={},
+            positions=[],
+            waste=unit_length,
+        )
 
-            # Add piece to new unit
-            if _try_add_piece(piece, new_unit, unit_length, saw_width):
-                units.append(new_unit)
-                current_unit_number += 1
-                remaining_pieces.pop(0)
-            else:
-                raise ValueError(
-                    f"Piece {piece} too long for unit length {unit_length}"
-                )
+        # Add piece to new unit
+        if not _try_add_piece(piece, new_unit, unit_length, saw_width, counters):
+            raise ValueError(f"Piece {piece} too long for unit length {unit_length}")
+        if counters is not None:
+            counters.units_opened += 1
+        units.append(new_unit)
+        heapq.heappush(by_space, (-new_unit.waste, len(units) - 1))
 
     return units
 
 
+# Powers of ten tried when turning lengths into integers
+_LENGTH_SCALES = (1, 10, 100, 1000)
+_SCALE_TOLERANCE = 1e-6
+# The subset-sum DP works in millimetres at most; finer lengths round up
+_SUBSET_SUM_MAX_SCALE = 10
+# Distinct lengths x scaled capacity above which subset sum falls back to FFD
+_SUBSET_SUM_BUDGET = 1_000_000
+# Fills within capacity / divisor of the best fill are treated as equally good
+_FILL_SLACK_DIVISOR = 100
+
+
+def _length_scale(values: Iterable[float], max_scale: int = _LENGTH_SCALES[-1]) -> int:
+    """Find the smallest power of ten that turns every value into an integer.
+
+    Gives up at ``max_scale`` when none does.
+    """
+    values = list(values)
+    for scale in _LENGTH_SCALES:
+        if scale >= max_scale:
+            break
+        if all(
+            abs(value * scale - round(value * scale)) < _SCALE_TOLERANCE
+            for value in values
+        ):
+            return scale
+    return max_scale
+
+
+def _scaled_sizes(
+    lengths: Iterable[float],
+    unit_length: float,
+    saw_width: float,
+    max_scale: int = _LENGTH_SCALES[-1],
+) -> Tuple[Dict[float, int], int]:
+    """Scale piece lengths and unit capacity to integers, saw width included.
+
+    Every piece takes its length plus one saw width, and a unit holds
+    ``unit_length + saw_width`` (the last cut needs no kerf). Pieces round up
+    and the capacity rounds down, so integer fits are always real fits.
+    """
+    lengths = list(lengths)
+    scale = _length_scale([unit_length, saw_width, *lengths], max_scale)
+    kerf = math.ceil(saw_width * scale - _SCALE_TOLERANCE)
+    capacity = math.floor(unit_length * scale + _SCALE_TOLERANCE) + kerf
+    size_of = {
+        length: math.ceil(length * scale - _SCALE_TOLERANCE) + kerf
+        for length in lengths
+    }
+    return size_of, capacity
+
+
+def _build_unit(
+    unit_number: int, lengths: List[float], unit_length: float, saw_width: float
+) -> WoodUnit:
+    """Build a unit with the given lengths cut back to back, longest first."""
+    unit = WoodUnit(unit_number=unit_number, pieces={}, positions=[], waste=0)
+    current_position = 0.0
+    for length in sorted(lengths, reverse=True):
+        unit.pieces[length] = unit.pieces.get(length, 0) + 1
+        unit.positions.append(
+            PiecePlacement(length=length, start_position=current_position)
+        )
+        current_position += length + saw_width
+    unit.waste = max(0.0, _calculate_remaining_space(unit, unit_length, saw_width))
+    return unit
+
+
+def _best_fill(
+    sizes: List[int], counts: List[int], capacity: int, slack: int = 0
+) -> Dict[int, int]:
+    """Pick the multiset of sizes whose total is closest to capacity.
+
+    Bounded subset-sum over Python big-int bitsets: bit ``s`` is set when a
+    total of ``s`` is reachable. Each distinct size is split into power-of-two
+    chunks of its count, so a size with count ``c`` costs ``log2(c)`` shifts.
+    Any total within ``slack`` of the best one is accepted, and chunks are
+    taken longest first so short pieces are saved for filling later units.
+    Sizes must be sorted longest first. Returns size index -> pieces used.
+    """
+    chunks: List[Tuple[int, int, int]] = []  # (size index, pieces, total size)
+    for index, (size, count) in enumerate(zip(sizes, counts)):
+        count = min(count, capacity // size)
+        chunk = 1
+        while count > 0:
+            take = min(chunk, count)
+            chunks.append((index, take, size * take))
+            count -= take
+            chunk *= 2
+
+    # Bit s of the suffix bitset of chunk j is set when chunks j onwards can
+    # total s. Only every step-th suffix is kept; the reconstruction rebuilds
+    # the rest one block at a time, so memory grows with sqrt(chunks).
+    mask = (1 << (capacity + 1)) - 1
+    step = max(1, math.isqrt(len(chunks)))
+    checkpoints = {len(chunks): 1}
+    reachable = 1
+    for j in range(len(chunks) - 1, -1, -1):
+        reachable = (reachable | (reachable << chunks[j][2])) & mask
+        if j % step == 0:
+            checkpoints[j] = reachable
+
+    best = reachable.bit_length() - 1
+    lowest = max(0, best - slack)
+    window = ((1 << (best + 1)) - 1) ^ ((1 << lowest) - 1)
+
+    # Take each chunk if the remaining chunks can still land in the window
+    total = 0
+    chosen: Dict[int, int] = defaultdict(int)
+    for start in range(0, len(chunks), step):
+        end = min(start + step, len(chunks))
+        block = [checkpoints[end]]
+        for j in range(end - 1, start, -1):
+            block.append((block[-1] | (block[-1] << chunks[j][2])) & mask)
+        block.reverse()  # block[j - start] is the suffix after chunk j
+        for j in range(start, end):
+            index, take, weight = chunks[j]
+            if (block[j - start] << (total + weight)) & window:
+                chosen[index] += take
+                total += weight
+    return dict(chosen)
+
+
+def _arrange_pieces_subset_sum(
+    pieces: List[WoodPiece],
+    unit_length: float,
+    saw_width: float,
+    counters: Optional[_SolverCounters] = None,
+) -> List[WoodUnit]:
+    """Arrange pieces by filling each new unit as close to full as possible.
+
+    Lengths are scaled to integers, rounded up to the millimetre at most, and
+    each unit gets the best subset-sum fill of the remaining pieces, allowing
+    1% slack in favour of longer pieces. A fill is repeated while the
+    remaining counts allow it, since it stays the best choice as long as it
+    is still available. Each fill search counts as one fit attempt, and no
+    unit is ever scanned. Orders with more distinct lengths than the DP
+    budget allows, or with pieces that only fit before rounding, are packed
+    with first fit decreasing instead.
+    """
+    counts = Counter(piece.length for piece in pieces)
+    lengths = sorted(counts, reverse=True)
+    size_of, capacity = _scaled_sizes(
+        lengths, unit_length, saw_width, _SUBSET_SUM_MAX_SCALE
+    )
+    sizes = [size_of[length] for length in lengths]
+
+    if len(lengths) * capacity > _SUBSET_SUM_BUDGET or sizes and sizes[0] > capacity:
+        return _arrange_pieces(pieces, unit_length, saw_width, counters)
+
+    remaining = [counts[length] for length in lengths]
+    units: List[WoodUnit] = []
+    while any(remaining):
+        fill = _best_fill(sizes, remaining, capacity, capacity // _FILL_SLACK_DIVISOR)
+        repeats = min(remaining[index] // count for index, count in fill.items())
+        if counters is not None:
+            counters.fit_attempts += 1
+            counters.units_opened += repeats
+        pattern = [
+            lengths[index] for index, count in fill.items() for _ in range(count)
+        ]
+        for _ in range(repeats):
+            units.append(_build_unit(len(units) + 1, pattern, unit_length, saw_width))
+        for index, count in fill.items():
+            remaining[index] -= count * repeats
+
+    return units
+
+
+# Packing strategies selectable through Settings.packing_strategy
+PACKING_STRATEGIES: Dict[str, Callable[..., List[WoodUnit]]] = {
+    "first_fit_decreasing": _arrange_pieces,
+    "subset_sum": _arrange_pieces_subset_sum,
+}
+
+
+# Units with the most free space that the local search moves pieces out of
+_EXCHANGE_SOURCES = 8
+
+# A unit in the local search: its pieces as sorted (scaled size, length) pairs
+_Bin = List[Tuple[int, float]]
+
+
+def _empty_unit(target: int, bins: Dict[int, _Bin], free: Dict[int, int]) -> bool:
+    """Move every piece of the target unit into other units, best fit first."""
+    trial = {key: space for key, space in free.items() if key != target}
+    moves = []
+    for item in reversed(bins[target]):
+        size = item[0]
+        fits = [key for key, space in trial.items() if space >= size]
+        if not fits:
+            return False
+        key = min(fits, key=trial.__getitem__)
+        trial[key] -= size
+        moves.append((key, item))
+
+    for key, item in moves:
+        insort(bins[key], item)
+        free[key] -= item[0]
+    del bins[target]
+    del free[target]
+    return True
+
+
+def _improving_exchange(
+    order: List[int], bins: Dict[int, _Bin], free: Dict[int, int], deadline: float
+) -> bool:
+    """Apply the first move or swap that consolidates free space.
+
+    Moving ``g`` of size from unit A to unit B changes the sum of squared free
+    space by ``2g(free[A] - free[B]) + 2g^2``, so it is an improvement exactly
+    when ``free[B] < free[A] + g``. Feasibility is ``g <= free[B]``. Both are
+    O(1) checks, and a swap is a move of the size difference of two pieces.
+    """
+    for a in order[:_EXCHANGE_SOURCES]:
+        if time.perf_counter() >= deadline:
+            return False
+        free_a = free[a]
+        for b in order:
+            if b == a:
+                continue
+            free_b = free[b]
+            previous_size = None
+            for index, (size, length) in enumerate(bins[a]):
+                if size == previous_size:
+                    continue
+                previous_size = size
+
+                # Move the piece from A to B
+                if size <= free_b and free_b < free_a + size:
+                    bins[a].pop(index)
+                    insort(bins[b], (size, length))
+                    free[a] += size
+                    free[b] -= size
+                    return True
+
+                # Swap it for the shortest piece of B that keeps both gains valid
+                lowest = size - free_b
+                highest = size - max(0, free_b - free_a)
+                j = bisect_left(bins[b], (lowest,))
+                if j < len(bins[b]) and bins[b][j][0] < highest:
+                    other = bins[b].pop(j)
+                    bins[a].pop(index)
+                    insort(bins[a], other)
+                    insort(bins[b], (size, length))
+                    free[a] += size - other[0]
+                    free[b] -= size - other[0]
+                    return True
+    return False
+
+
+def _improve_units(
+    units: List[WoodUnit],
+    unit_length: float,
+    saw_width: float,
+    max_iterations: int,
+    time_limit: float,
+) -> Tuple[List[WoodUnit], int]:
+    """Improve a packing with a time-bounded move and swap local search.
+
+    Each iteration first tries to empty the unit with the most free space into
+    the others. Failing that, it applies one move or swap that consolidates
+    waste into fewer, longer offcuts, which often makes room to empty a unit
+    later on. Stops at a local optimum, after ``max_iterations`` or after
+    ``time_limit`` seconds. Returns the renumbered units and the units saved.
+    """
+    lengths = {pos.length for unit in units for pos in unit.positions}
+    size_of, capacity = _scaled_sizes(lengths, unit_length, saw_width)
+    bins = {
+        key: sorted((size_of[pos.length], pos.length) for pos in unit.positions)
+        for key, unit in enumerate(units)
+    }
+    free = {
+        key: capacity - sum(size for size, _ in items) for key, items in bins.items()
+    }
+    if any(space < 0 for space in free.values()):
+        # Rounded sizes overflow a unit, so integer fits would not be exact
+        return units, 0
+
+    deadline = time.perf_counter() + time_limit
+    units_saved = 0
+    for _ in range(max_iterations):
+        if len(bins) < 2 or time.perf_counter() >= deadline:
+            break
+
+        order = sorted(bins, key=free.__getitem__, reverse=True)
+        if _empty_unit(order[0], bins, free):
+            units_saved += 1
+            continue
+        if not _improving_exchange(order, bins, free, deadline):
+            break
+        for key in [key for key, items in bins.items() if not items]:
+            del bins[key]
+            del free[key]
+            units_saved += 1
+
+    improved = [
+        _build_unit(number, [length for _, length in bins[key]], unit_length, saw_width)
+        for number, key in enumerate(sorted(bins), 1)
+    ]
+    return improved, units_saved
+
+
 def _calculate_waste_statistics(
-    arrangements: List[WoodArrangement],
+    arrangements: Sequence[Union[WoodArrangement, SheetArrangement]],
     settings: Settings,
 ) -> WasteStatistics:
     """Calculate detailed waste statistics for the arrangements."""
@@ -111,9 +468,9 @@ def _calculate_waste_statistics(
 
     for arr in arrangements:
         wood_type = arr.wood_type
-        wood_settings = settings.wood_types[wood_type]
+        unit_capacity = settings.unit_capacity(wood_type)
         type_waste = sum(unit.waste for unit in arr.units)
-        type_total = len(arr.units) * wood_settings.unit_length
+        type_total = len(arr.units) * unit_capacity
 
         # Calculate waste for this type
         waste_by_type[wood_type] = type_waste
@@ -125,12 +482,12 @@ def _calculate_waste_statistics(
 
         # Generate saving suggestions
         avg_waste = type_waste / len(arr.units) if arr.units else 0
-        if avg_waste > wood_settings.unit_length * 0.1:  # More than 10% waste
+        if avg_waste > unit_capacity * 0.1:  # More than 10% waste
             potential_savings[wood_type] = (
                 "Consider combining orders or finding smaller pieces to fill gaps"
             )
         elif len(arr.units) > 1 and any(
-            unit.waste > wood_settings.unit_length * 0.2 for unit in arr.units
+            unit.waste > unit_capacity * 0.2 for unit in arr.units
         ):
             potential_savings[wood_type] = (
                 "Large waste in some units - consider rearranging pieces"
@@ -153,29 +510,50 @@ def _calculate_waste_statistics(
     )
 
 
+def group_pieces(pieces: Iterable[WoodPiece]) -> PieceCounts:
+    """Group pieces by wood type and length, summing their counts."""
+    piece_counts: PieceCounts = defaultdict(dict)
+    for piece in pieces:
+        lengths = piece_counts[piece.type]
+        lengths[piece.length] = lengths.get(piece.length, 0) + piece.count
+    return dict(piece_counts)
+
+
 def calculate_wood_arrangement(
     pieces: List[WoodPiece], settings: Settings
 ) -> CalculationResult:
     """Calculate optimal wood cutting arrangement."""
-    # Group pieces by wood type
-    pieces_by_type: Dict[str, List[WoodPiece]] = defaultdict(list)
-    for piece in pieces:
-        pieces_by_type[piece.type].extend([piece] * piece.count)
+    return calculate_grouped_arrangement(group_pieces(pieces), settings)
 
+
+def _expand_pieces(wood_type: str, lengths: Dict[float, int]) -> List[WoodPiece]:
+    """Turn one wood type's length counts back into a list of single pieces."""
+    type_pieces: List[WoodPiece] = []
+    for length, count in lengths.items():
+        piece = WoodPiece(type=wood_type, length=length, count=count)
+        type_pieces.extend([piece] * count)
+    return type_pieces
+
+
+def _build_result(
+    units_by_type: Dict[str, List[WoodUnit]],
+    settings: Settings,
+    units_saved: Dict[str, int],
+    diagnostics: Optional[Dict[str, TypeDiagnostics]] = None,
+    started: float = 0.0,
+) -> CalculationResult:
+    """Price the units of each wood type and gather the statistics.
+
+    With per-type ``diagnostics``, the result also reports the time spent on
+    statistics and the total since ``started``.
+    """
     arrangements = []
     total_units = {}
     costs = {}
     total_cost = 0
 
-    for wood_type, type_pieces in pieces_by_type.items():
-        if wood_type not in settings.wood_types:
-            raise ValueError(f"Unknown wood type: {wood_type}")
-
+    for wood_type, arrangement in units_by_type.items():
         wood_settings = settings.wood_types[wood_type]
-        arrangement = _arrange_pieces(
-            type_pieces, wood_settings.unit_length, settings.saw_width
-        )
-
         units_needed = len(arrangement)
         type_cost = units_needed * wood_settings.price
 
@@ -185,12 +563,144 @@ def calculate_wood_arrangement(
         total_cost += type_cost
 
     # Calculate waste statistics
-    waste_statistics = _calculate_waste_statistics(arrangements, settings)
-
-    return CalculationResult(
-        arrangements=arrangements,
-        total_units=total_units,
-        costs=costs,
-        total_cost=total_cost,
-        waste_statistics=waste_statistics,
+    statistics_started = time.perf_counter()
+    with phase("stats"):
+        waste_statistics = _calculate_waste_statistics(arrangements, settings)
+
+    with phase("validate"):
+        result = CalculationResult(
+            arrangements=arrangements,
+            total_units=total_units,
+            costs=costs,
+            total_cost=total_cost,
+            waste_statistics=waste_statistics,
+            units_saved=units_saved,
+        )
+    if diagnostics is not None:
+        finished = time.perf_counter()
+        result.diagnostics = Diagnostics(
+            by_type=diagnostics,
+            statistics_seconds=finished - statistics_started,
+            total_seconds=finished - started,
+        )
+    return result
+
+
+def _check_wood_types(piece_counts: PieceCounts, settings: Settings) -> None:
+    """Reject pieces whose wood type is missing from the settings."""
+    for wood_type in piece_counts:
+        if wood_type not in settings.wood_types:
+            raise ValueError(f"Unknown wood type: {wood_type}")
+
+
+def calculate_grouped_arrangement(
+    piece_counts: PieceCounts, settings: Settings
+) -> CalculationResult:
+    """Calculate optimal wood cutting arrangement from grouped piece counts."""
+    started = time.perf_counter()
+    _check_wood_types(piece_counts, settings)
+    units_by_type = {}
+    units_saved = {}
+    diagnostics = {} if settings.collect_diagnostics else None
+
+    with phase("solve"):
+        for wood_type, lengths in piece_counts.items():
+            wood_settings = settings.wood_types[wood_type]
+            arrange = PACKING_STRATEGIES[settings.packing_strategy]
+            counters = _SolverCounters() if diagnostics is not None else None
+            pack_started = time.perf_counter()
+            arrangement = arrange(
+                _expand_pieces(wood_type, lengths),
+                wood_settings.unit_length,
+                settings.saw_width,
+                counters,
+            )
+            improve_started = time.perf_counter()
+            if settings.improvement_time_limit > 0:
+                arrangement, units_saved[wood_type] = _improve_units(
+                    arrangement,
+                    wood_settings.unit_length,
+                    settings.saw_width,
+                    settings.improvement_max_iterations,
+                    settings.improvement_time_limit,
+                )
+            units_by_type[wood_type] = arrangement
+            if counters is not None:
+                diagnostics[wood_type] = TypeDiagnostics(
+                    pieces=sum(lengths.values()),
+                    fit_attempts=counters.fit_attempts,
+                    failed_fits=counters.failed_fits,
+                    units_scanned=counters.units_scanned,
+                    max_units_scanned=counters.max_units_scanned,
+                    units_opened=counters.units_opened,
+                    pack_seconds=improve_started - pack_started,
+                    improve_seconds=time.perf_counter() - improve_started,
+                )
+
+    return _build_result(units_by_type, settings, units_saved, diagnostics, started)
+
+
+# Local search budget for streamed solves when the settings do not set one
+STREAM_IMPROVEMENT_TIME_LIMIT = 2.0
+
+
+def _plan_rank(result: CalculationResult) -> Tuple[float, int, float]:
+    """Rank plans: cheaper first, then fewer units, then longer offcuts."""
+    offcuts = result.waste_statistics.waste_distribution.values()
+    return (
+        result.total_cost,
+        sum(result.total_units.values()),
+        -sum(waste * waste for wastes in offcuts for waste in wastes),
     )
+
+
+def iter_improving_arrangements(
+    piece_counts: PieceCounts, settings: Settings
+) -> Iterator[Tuple[str, CalculationResult]]:
+    """Yield a quick plan first, then every strictly better plan found.
+
+    The first plan comes from first fit decreasing. The subset-sum strategy
+    and the local search on the best plan follow, one wood type at a time.
+    Each yield is a (stage name, result) pair and ranks strictly better than
+    the one before it.
+    """
+    _check_wood_types(piece_counts, settings)
+    type_pieces = {
+        wood_type: _expand_pieces(wood_type, lengths)
+        for wood_type, lengths in piece_counts.items()
+    }
+
+    def arrange_all(strategy: str) -> Dict[str, List[WoodUnit]]:
+        return {
+            wood_type: PACKING_STRATEGIES[strategy](
+                pieces, settings.wood_types[wood_type].unit_length, settings.saw_width
+            )
+            for wood_type, pieces in type_pieces.items()
+        }
+
+    best_units = arrange_all("first_fit_decreasing")
+    best = _build_result(best_units, settings, {})
+    yield "first_fit_decreasing", best
+
+    units = arrange_all("subset_sum")
+    result = _build_result(units, settings, {})
+    if _plan_rank(result) < _plan_rank(best):
+        best_units, best = units, result
+        yield "subset_sum", best
+
+    time_limit = settings.improvement_time_limit or STREAM_IMPROVEMENT_TIME_LIMIT
+    units_saved = {}
+    for wood_type in best_units:
+        units = dict(best_units)
+        units[wood_type], saved = _improve_units(
+            best_units[wood_type],
+            settings.wood_types[wood_type].unit_length,
+            settings.saw_width,
+            settings.improvement_max_iterations,
+            time_limit / len(best_units),
+        )
+        result = _build_result(units, settings, {**units_saved, wood_type: saved})
+        if _plan_rank(result) < _plan_rank(best):
+            best_units, best = units, result
+            units_saved[wood_type] = saved
+            yield "local_search", best
@@ -1,32 +1,43 @@
 import json
 import csv
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 import click
 from tabulate import tabulate
 
-from .models import WoodPiece, Settings
-from .calculator import calculate_wood_arrangement
+from .models import WoodPiece, Project, Settings, SettingsVariant
+from .calculator import (
+    PieceCounts,
+    calculate_grouped_arrangement,
+    calculate_wood_arrangement,
+)
+from .consolidation import calculate_consolidated_arrangement
+from .sweep import expand_grid, run_sweep
+from .online import DEFAULT_WINDOW, OnlinePacker
+from .loaders import load_piece_counts, load_pieces
+from .binary_format import SUFFIX as BINARY_SUFFIX, write_binary_pieces
 from .csv_exporter import (
     generate_purchase_order,
     generate_arrangements,
     generate_waste_analysis,
     generate_cutting_plan,
 )
+from .columnar_exporter import FORMATS, export_tables
+from .plan_store import PlanStore
+from .timing import PHASES, TOTAL, profile_request as profile_request_timings
+from .report import (
+    REPORT_MODES,
+    format_currency,
+    format_percentage,
+    render_diagnostics,
+    render_report,
+)
 
 
 def print_separator(char="=", length=50):
     click.echo(char * length)
 
 
-def format_currency(amount: float, currency: str) -> str:
-    return f"{amount:.2f}{currency}"
-
-
-def format_percentage(value: float) -> str:
-    return f"{value:.1f}%"
-
-
 def save_csv(data: List[List[str]], output_file: str):
     """Save data to a CSV file."""
     with open(output_file, "w", newline="") as f:
@@ -35,18 +46,34 @@ def save_csv(data: List[List[str]], output_file: str):
     click.echo(f"CSV file saved to: {output_file}")
 
 
+def load_settings(settings_file: str) -> Settings:
+    """Load and parse the settings file."""
+    with open(settings_file) as f:
+        settings_data = json.load(f)
+
+    return Settings(**settings_data)
+
+
 def load_input_files(
     pieces_file: str, settings_file: str
 ) -> tuple[List[WoodPiece], Settings]:
     """Load and parse input files."""
-    with open(pieces_file) as f:
-        pieces_data = json.load(f)
-    with open(settings_file) as f:
-        settings_data = json.load(f)
+    try:
+        pieces = load_pieces(pieces_file)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="'--pieces'")
+    return pieces, load_settings(settings_file)
+
 
-    pieces = [WoodPiece(**piece) for piece in pieces_data]
-    settings = Settings(**settings_data)
-    return pieces, settings
+def load_grouped_input_files(
+    pieces_file: str, settings_file: str
+) -> Tuple[PieceCounts, Settings]:
+    """Load input files with the pieces grouped for the calculator."""
+    try:
+        piece_counts = load_piece_counts(pieces_file)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="'--pieces'")
+    return piece_counts, load_settings(settings_file)
 
 
 @click.group()
@@ -62,7 +89,7 @@ def cli():
     "pieces_file",
     type=click.Path(exists=True),
     required=True,
-    help="JSON file containing list of required pieces",
+    help="JSON, JSON-lines, CSV or .wcb file containing list of required pieces",
 )
 @click.option(
     "--settings",
@@ -72,98 +99,45 @@ def cli():
     required=True,
     help="JSON file containing wood types and settings",
 )
-def calculate(pieces_file: str, settings_file: str):
+@click.option(
+    "--mode",
+    "-m",
+    type=click.Choice(REPORT_MODES),
+    default="full",
+    show_default=True,
+    help="List every unit, group units by identical cuts, or show the summary only",
+)
+@click.option(
+    "--limit",
+    "-n",
+    type=click.IntRange(min=0),
+    help="List at most this many units or patterns per wood type",
+)
+@click.option("--pager", is_flag=True, help="Page the report through $PAGER")
+@click.option(
+    "--stats", is_flag=True, help="Show solver counters and timings per wood type"
+)
+def calculate(
+    pieces_file: str,
+    settings_file: str,
+    mode: str,
+    limit: Optional[int],
+    pager: bool,
+    stats: bool,
+):
     """Calculate optimal wood cutting arrangement."""
-    pieces, settings = load_input_files(pieces_file, settings_file)
-    result = calculate_wood_arrangement(pieces, settings)
+    piece_counts, settings = load_grouped_input_files(pieces_file, settings_file)
+    if stats:
+        settings = settings.model_copy(update={"collect_diagnostics": True})
+    result = calculate_grouped_arrangement(piece_counts, settings)
 
-    # Output results
-    click.echo("\nWood Cutting Arrangement")
-    print_separator()
-    click.echo()
-
-    summary_data = []
-
-    for arr in result.arrangements:
-        wood_type = arr.wood_type
-        units_needed = result.total_units[wood_type]
-        cost = result.costs[wood_type]
-        wood_waste = result.waste_statistics.waste_by_type[wood_type]
-        unit_length = settings.wood_types[wood_type].unit_length
-
-        # Add to summary data
-        summary_data.append(
-            [
-                wood_type,
-                unit_length,
-                units_needed,
-                format_currency(cost, settings.currency),
-                f"{wood_waste:.1f}cm",
-                format_percentage(
-                    wood_waste
-                    / (units_needed * settings.wood_types[wood_type].unit_length)
-                    * 100
-                ),
-            ]
-        )
-
-        # Detailed arrangement output
-        click.echo(f"Wood Type: {wood_type}")
-        click.echo(f"Unit Length: {unit_length}cm")
-        click.echo(f"Number of units needed: {units_needed}")
-        click.echo(f"Cost: {format_currency(cost, settings.currency)}")
-        click.echo(f"Total waste: {wood_waste:.1f}cm")
-        click.echo(
-            f"Suggestion: {result.waste_statistics.potential_savings[wood_type]}"
-        )
-        click.echo()
-
-        for unit in arr.units:
-            click.echo(f"  Unit {unit.unit_number}")
-            print_separator("-", 30)
-            click.echo("  Pieces:")
-            for length, count in unit.pieces.items():
-                click.echo(f"    - {count}x {length}cm")
-            click.echo(f"  Waste: {unit.waste:.1f}cm")
-            print_separator("-", 30)
-            click.echo()
-
-        print_separator()
-        click.echo()
-
-    # Print summary table
-    click.echo("\nOrder Summary")
-    print_separator()
-    click.echo()
-
-    headers = ["Wood Type", "Unit Length (cm)", "Units", "Cost", "Waste", "Waste %"]
-    click.echo(tabulate(summary_data, headers=headers, tablefmt="grid"))
-    click.echo()
-
-    # Print waste statistics
-    click.echo("\nWaste Analysis")
-    print_separator()
-    click.echo()
-
-    click.echo(f"Total Wood Used: {result.waste_statistics.total_wood_used:.1f}cm")
-    click.echo(f"Total Waste: {result.waste_statistics.total_waste:.1f}cm")
-    click.echo(
-        f"Overall Waste Percentage: {format_percentage(result.waste_statistics.waste_percentage)}"
-    )
-    click.echo()
-
-    click.echo("Waste Distribution by Type:")
-    for wood_type, waste_lengths in result.waste_statistics.waste_distribution.items():
-        if waste_lengths:
-            avg_waste = sum(waste_lengths) / len(waste_lengths)
-            max_waste = max(waste_lengths)
-            click.echo(f"  {wood_type}:")
-            click.echo(f"    Average waste per unit: {avg_waste:.1f}cm")
-            click.echo(f"    Largest waste piece: {max_waste:.1f}cm")
-    click.echo()
-
-    click.echo(f"Total Cost: {format_currency(result.total_cost, settings.currency)}")
-    print_separator()
+    report = render_report(result, settings, mode, limit)
+    if result.diagnostics is not None:
+        report += "\n" + render_diagnostics(result.diagnostics)
+    if pager:
+        click.echo_via_pager(report)
+    else:
+        click.echo(report)
 
 
 @cli.command()
@@ -173,7 +147,7 @@ def calculate(pieces_file: str, settings_file: str):
     "pieces_file",
     type=click.Path(exists=True),
     required=True,
-    help="JSON file containing list of required pieces",
+    help="JSON, JSON-lines, CSV or .wcb file containing list of required pieces",
 )
 @click.option(
     "--settings",
@@ -206,7 +180,7 @@ def export_purchase_order(pieces_file: str, settings_file: str, output_file: str
     "pieces_file",
     type=click.Path(exists=True),
     required=True,
-    help="JSON file containing list of required pieces",
+    help="JSON, JSON-lines, CSV or .wcb file containing list of required pieces",
 )
 @click.option(
     "--settings",
@@ -239,7 +213,7 @@ def export_arrangements(pieces_file: str, settings_file: str, output_file: str):
     "pieces_file",
     type=click.Path(exists=True),
     required=True,
-    help="JSON file containing list of required pieces",
+    help="JSON, JSON-lines, CSV or .wcb file containing list of required pieces",
 )
 @click.option(
     "--settings",
@@ -272,7 +246,7 @@ def export_waste_analysis(pieces_file: str, settings_file: str, output_file: str
     "pieces_file",
     type=click.Path(exists=True),
     required=True,
-    help="JSON file containing list of required pieces",
+    help="JSON, JSON-lines, CSV or .wcb file containing list of required pieces",
 )
 @click.option(
     "--settings",
@@ -305,7 +279,7 @@ def export_cutting_plan(pieces_file: str, settings_file: str, output_file: str):
     "pieces_file",
     type=click.Path(exists=True),
     required=True,
-    help="JSON file containing list of required pieces",
+    help="JSON, JSON-lines, CSV or .wcb file containing list of required pieces",
 )
 @click.option(
     "--settings",
@@ -349,5 +323,363 @@ def export_all(pieces_file: str, settings_file: str, output_dir: str):
     save_csv(csv_data, output_path / "cutting_plan.csv")
 
 
+@cli.command()
+@click.option(
+    "--pieces",
+    "-p",
+    "pieces_file",
+    type=click.Path(exists=True),
+    required=True,
+    help="JSON, JSON-lines, CSV or .wcb file containing list of required pieces",
+)
+@click.option(
+    "--settings",
+    "-s",
+    "settings_file",
+    type=click.Path(exists=True),
+    required=True,
+    help="JSON file containing wood types and settings",
+)
+@click.option(
+    "--output-dir",
+    "-o",
+    "output_dir",
+    type=click.Path(),
+    required=True,
+    help="Directory to save the table files",
+)
+@click.option(
+    "--format",
+    "-f",
+    "fmt",
+    type=click.Choice(list(FORMATS)),
+    default="parquet",
+    show_default=True,
+    help="Columnar file format",
+)
+def export_columnar(pieces_file: str, settings_file: str, output_dir: str, fmt: str):
+    """Export units, placements and waste as typed Parquet or Arrow tables."""
+    pieces, settings = load_input_files(pieces_file, settings_file)
+    result = calculate_wood_arrangement(pieces, settings)
+    try:
+        paths = export_tables(result, settings, output_dir, fmt)
+    except ImportError as e:
+        raise click.ClickException(str(e))
+    for path in paths:
+        click.echo(f"Table saved to: {path}")
+
+
+@cli.command()
+@click.option(
+    "--pieces",
+    "-p",
+    "pieces_files",
+    type=click.Path(exists=True),
+    required=True,
+    multiple=True,
+    help="Pieces file of one project, named after the file; repeat per project",
+)
+@click.option(
+    "--settings",
+    "-s",
+    "settings_file",
+    type=click.Path(exists=True),
+    required=True,
+    help="JSON file containing wood types and settings",
+)
+def calculate_consolidated(pieces_files: List[str], settings_file: str):
+    """Pack several projects together and split the costs between them."""
+    settings = load_settings(settings_file)
+    projects = []
+    for pieces_file in pieces_files:
+        try:
+            pieces = load_pieces(pieces_file)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="'--pieces'")
+        projects.append(Project(name=Path(pieces_file).stem, pieces=pieces))
+    try:
+        consolidated = calculate_consolidated_arrangement(projects, settings)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="'--pieces'")
+    result = consolidated.result
+
+    click.echo("\nConsolidated Order")
+    print_separator()
+    click.echo()
+    headers = ["Wood Type", "Unit Length (cm)", "Units", "Cost"]
+    rows = [
+        [
+            wood_type,
+            settings.wood_types[wood_type].unit_length,
+            units,
+            format_currency(result.costs[wood_type], settings.currency),
+        ]
+        for wood_type, units in result.total_units.items()
+    ]
+    click.echo(tabulate(rows, headers=headers, tablefmt="grid"))
+    click.echo()
+
+    click.echo("\nCost by Project")
+    print_separator()
+    click.echo()
+    headers = ["Project", "Pieces", "Units", "Cost"]
+    rows = [
+        [
+            name,
+            share.pieces,
+            f"{sum(share.units.values()):.2f}",
+            format_currency(share.total_cost, settings.currency),
+        ]
+        for name, share in consolidated.projects.items()
+    ]
+    click.echo(tabulate(rows, headers=headers, tablefmt="grid"))
+    click.echo()
+
+    click.echo(f"Total Cost: {format_currency(result.total_cost, settings.currency)}")
+    print_separator()
+
+
+@cli.command()
+@click.option(
+    "--pieces",
+    "-p",
+    "pieces_file",
+    type=click.Path(exists=True),
+    required=True,
+    help="JSON, JSON-lines, CSV or .wcb file containing list of required pieces",
+)
+@click.option(
+    "--output",
+    "-o",
+    "output_file",
+    type=click.Path(),
+    required=True,
+    help=f"Path to save the binary cut list ({BINARY_SUFFIX})",
+)
+def convert_pieces(pieces_file: str, output_file: str):
+    """Convert a pieces file to the memory-mapped binary cut list format."""
+    try:
+        piece_counts = load_piece_counts(pieces_file)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="'--pieces'")
+    records = write_binary_pieces(piece_counts, output_file)
+    click.echo(f"Binary cut list with {records} records saved to: {output_file}")
+
+
+def _parse_value(text: str) -> Any:
+    """A JSON value, or the text itself when it is not valid JSON."""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+def _parse_grid(
+    ctx: click.Context, param: click.Parameter, values: Tuple[str, ...]
+) -> Dict[str, List[Any]]:
+    grid = {}
+    for value in values:
+        path, sep, options = value.partition("=")
+        if not sep or not options:
+            raise click.BadParameter(f"expected PATH=VALUE[,VALUE...], got {value!r}")
+        grid[path.strip()] = [_parse_value(option) for option in options.split(",")]
+    return grid
+
+
+@cli.command()
+@click.option(
+    "--pieces",
+    "-p",
+    "pieces_file",
+    type=click.Path(exists=True),
+    required=True,
+    help="JSON, JSON-lines, CSV or .wcb file containing list of required pieces",
+)
+@click.option(
+    "--settings",
+    "-s",
+    "settings_file",
+    type=click.Path(exists=True),
+    required=True,
+    help="JSON file containing wood types and settings",
+)
+@click.option(
+    "--grid",
+    "-g",
+    multiple=True,
+    callback=_parse_grid,
+    help="Settings path and values to try, e.g. saw_width=0.3,0.32 (repeatable)",
+)
+@click.option(
+    "--variants",
+    "variants_file",
+    type=click.Path(exists=True),
+    help='JSON list of {"name": ..., "overrides": {...}} scenarios',
+)
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
+    help="Solver processes (default: one per CPU)",
+)
+def sweep(
+    pieces_file: str,
+    settings_file: str,
+    grid: Dict[str, List[Any]],
+    variants_file: Optional[str],
+    workers: Optional[int],
+):
+    """Compare units, cost and waste across settings variants."""
+    piece_counts, settings = load_grouped_input_files(pieces_file, settings_file)
+    variants = []
+    if variants_file:
+        with open(variants_file) as f:
+            variants = [SettingsVariant(**variant) for variant in json.load(f)]
+    variants += expand_grid(grid)
+    try:
+        result = run_sweep(piece_counts, settings, variants, workers)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    click.echo("\nWhat-if Sweep")
+    print_separator()
+    click.echo()
+    headers = ["Scenario", "Units", "Cost", "Waste (cm)", "Waste %"]
+    rows = [
+        [
+            scenario.name,
+            scenario.units,
+            format_currency(scenario.total_cost, settings.currency),
+            f"{scenario.total_waste:.1f}",
+            f"{scenario.waste_percentage:.1f}%",
+        ]
+        for scenario in result.scenarios
+    ]
+    click.echo(tabulate(rows, headers=headers, tablefmt="grid"))
+    click.echo()
+    cheapest = min(result.scenarios, key=lambda scenario: scenario.total_cost)
+    click.echo(f"Cheapest: {cheapest.name}")
+    click.echo(f"{len(result.scenarios)} scenarios from {result.solves} packings")
+    print_separator()
+
+
+@cli.command()
+@click.option(
+    "--settings",
+    "-s",
+    "settings_file",
+    type=click.Path(exists=True),
+    required=True,
+    help="JSON file containing wood types and settings",
+)
+@click.option(
+    "--input",
+    "-i",
+    "input_file",
+    type=click.File("r"),
+    default="-",
+    help="NDJSON pieces and flush commands (default: stdin)",
+)
+@click.option(
+    "--window",
+    "-w",
+    type=click.IntRange(min=1),
+    default=DEFAULT_WINDOW,
+    show_default=True,
+    help="Open units kept per wood type",
+)
+@click.option(
+    "--min-length",
+    type=click.FloatRange(min=0),
+    default=0,
+    help="Finish a unit once a piece this long no longer fits (e.g. shortest piece)",
+)
+def pack_stream(settings_file: str, input_file, window: int, min_length: float):
+    """Pack pieces online as they arrive, printing finished boards as NDJSON.
+
+    Each input line is a piece object or {"command": "flush"}. Boards are
+    printed as soon as they are finished; the rest are flushed at the end.
+    """
+    with open(settings_file) as f:
+        settings = Settings(**json.load(f))
+    packer = OnlinePacker(settings, window, min_length)
+    stdout = click.get_text_stream("stdout")
+
+    for line_number, line in enumerate(input_file, 1):
+        for event in packer.handle_line(line, line_number):
+            stdout.write(json.dumps(event) + "\n")
+        stdout.flush()
+    for event in packer.finish():
+        stdout.write(json.dumps(event) + "\n")
+    stdout.flush()
+
+
+@cli.command()
+@click.argument("request_file", type=click.Path(exists=True))
+@click.option(
+    "--route",
+    default="/api/calculate",
+    show_default=True,
+    help="API route to POST the request to",
+)
+@click.option(
+    "--runs",
+    "-n",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="Measured runs to average",
+)
+@click.option(
+    "--warmup",
+    type=click.IntRange(min=0),
+    default=1,
+    show_default=True,
+    help="Unmeasured runs first",
+)
+def profile_request(request_file: str, route: str, runs: int, warmup: int):
+    """Replay a saved API request in-process and break its time down by phase.
+
+    REQUEST_FILE is a JSON request body, as sent to the API. The request goes
+    straight to the app through ASGI, with no server or network, and plans
+    are not stored, so every run solves it again. The phases are those of
+    the Server-Timing header, averaged over the runs.
+    """
+    # The API pulls in FastAPI, which other commands do not need
+    from . import api
+
+    with open(request_file, "rb") as f:
+        body = f.read()
+
+    store = api.plan_store
+    api.plan_store = PlanStore("")
+    try:
+        samples = profile_request_timings(api.app, route, body, runs, warmup)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    finally:
+        api.plan_store = store
+
+    total = sum(samples[TOTAL]) / runs
+    rows = []
+    for name, values in samples.items():
+        mean = sum(values) / runs
+        rows.append(
+            [
+                name,
+                PHASES.get(name, ""),
+                f"{mean:.2f}",
+                f"{min(values):.2f}",
+                f"{max(values):.2f}",
+                format_percentage(mean / total * 100) if name != TOTAL else "",
+            ]
+        )
+
+    click.echo(f"\nPOST {route}, {runs} runs after {warmup} warm-up")
+    print_separator()
+    headers = ["Phase", "Description", "Mean ms", "Min ms", "Max ms", "Share"]
+    click.echo(tabulate(rows, headers=headers, tablefmt="grid"))
+
+
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,168 @@
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union
+
+from .models import Settings, CalculationResult
+
+# Column names and Arrow types of each flat table
+SCHEMAS: Dict[str, List[Tuple[str, str]]] = {
+    "units": [
+        ("wood_type", "string"),
+        ("unit_number", "int32"),
+        ("capacity", "float64"),  # cm, or cm² for sheets
+        ("piece_count", "int32"),
+        ("used", "float64"),
+        ("waste", "float64"),
+        ("price", "float64"),
+    ],
+    "placements": [
+        ("wood_type", "string"),
+        ("unit_number", "int32"),
+        ("length", "float64"),
+        ("start_position", "float64"),
+    ],
+    "sheet_placements": [
+        ("wood_type", "string"),
+        ("unit_number", "int32"),
+        ("width", "float64"),
+        ("height", "float64"),
+        ("x", "float64"),
+        ("y", "float64"),
+        ("rotated", "bool"),
+    ],
+    "waste": [
+        ("wood_type", "string"),
+        ("units", "int32"),
+        ("total_waste", "float64"),
+        ("waste_percentage", "float64"),
+        ("suggestion", "string"),
+    ],
+}
+
+FORMATS = {
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+    "arrow": (".arrow", "application/vnd.apache.arrow.file"),
+}
+
+Columns = Dict[str, List[Any]]
+
+
+def _empty_columns(table: str) -> Columns:
+    return {name: [] for name, _ in SCHEMAS[table]}
+
+
+def generate_columns(
+    result: CalculationResult, settings: Settings
+) -> Dict[str, Columns]:
+    """Flatten a result into typed columns, one dict of lists per table.
+
+    Each list is appended to straight from the result's units, with no
+    section headers or spacer rows, so the tables load without parsing.
+    """
+    tables = {table: _empty_columns(table) for table in SCHEMAS}
+    units = tables["units"]
+    placements = tables["placements"]
+    sheet_placements = tables["sheet_placements"]
+
+    for arr in result.arrangements + result.sheet_arrangements:
+        wood_type = arr.wood_type
+        capacity = settings.unit_capacity(wood_type)
+        price = settings.unit_price(wood_type)
+        for unit in arr.units:
+            units["wood_type"].append(wood_type)
+            units["unit_number"].append(unit.unit_number)
+            units["capacity"].append(capacity)
+            units["piece_count"].append(sum(unit.pieces.values()))
+            units["used"].append(capacity - unit.waste)
+            units["waste"].append(unit.waste)
+            units["price"].append(price)
+
+        if wood_type in settings.sheet_types:
+            for unit in arr.units:
+                for placement in unit.placements:
+                    sheet_placements["wood_type"].append(wood_type)
+                    sheet_placements["unit_number"].append(unit.unit_number)
+                    sheet_placements["width"].append(placement.width)
+                    sheet_placements["height"].append(placement.height)
+                    sheet_placements["x"].append(placement.x)
+                    sheet_placements["y"].append(placement.y)
+                    sheet_placements["rotated"].append(placement.rotated)
+        else:
+            for unit in arr.units:
+                count = len(unit.positions)
+                placements["wood_type"].extend([wood_type] * count)
+                placements["unit_number"].extend([unit.unit_number] * count)
+                for position in unit.positions:
+                    placements["length"].append(position.length)
+                    placements["start_position"].append(position.start_position)
+
+    stats = result.waste_statistics
+    waste = tables["waste"]
+    for wood_type, type_waste in stats.waste_by_type.items():
+        units_needed = result.total_units[wood_type]
+        type_total = units_needed * settings.unit_capacity(wood_type)
+        waste["wood_type"].append(wood_type)
+        waste["units"].append(units_needed)
+        waste["total_waste"].append(type_waste)
+        waste["waste_percentage"].append(
+            type_waste / type_total * 100 if type_total else 0.0
+        )
+        waste["suggestion"].append(stats.potential_savings[wood_type])
+
+    return tables
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "Columnar exports need pyarrow: pip install 'woodcut-planner[columnar]'"
+        ) from None
+    return pyarrow
+
+
+def to_arrow_table(columns: Columns, table: str):
+    """Build a typed pyarrow Table from one table's columns."""
+    pa = _pyarrow()
+    schema = pa.schema(
+        [(name, pa.type_for_alias(alias)) for name, alias in SCHEMAS[table]]
+    )
+    return pa.Table.from_pydict(columns, schema=schema)
+
+
+def write_table(columns: Columns, table: str, sink: Any, fmt: str = "parquet") -> None:
+    """Write one table as Parquet or an Arrow IPC file to a path or buffer."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown columnar format: {fmt}")
+    arrow_table = to_arrow_table(columns, table)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(arrow_table, sink)
+    else:
+        import pyarrow.ipc as ipc
+
+        with ipc.new_file(sink, arrow_table.schema) as writer:
+            writer.write_table(arrow_table)
+
+
+def export_tables(
+    result: CalculationResult,
+    settings: Settings,
+    output_dir: Union[str, Path],
+    fmt: str = "parquet",
+) -> List[Path]:
+    """Write every table of a result to ``output_dir``, one file per table."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown columnar format: {fmt}")
+    _pyarrow()
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    suffix = FORMATS[fmt][0]
+
+    written = []
+    for table, columns in generate_columns(result, settings).items():
+        path = output_path / f"{table}{suffix}"
+        write_table(columns, table, str(path), fmt)
+        written.append(path)
+    return written
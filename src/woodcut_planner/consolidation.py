@@ -0,0 +1,91 @@
+from collections import Counter, defaultdict, deque
+from typing import Deque, Dict, List, Tuple
+
+from .models import (
+    Project,
+    ProjectShare,
+    Settings,
+    ConsolidatedResult,
+)
+from .calculator import PieceCounts, calculate_grouped_arrangement
+
+# Projects still owed pieces of one (wood type, length), as [name, remaining]
+_Claims = Deque[List]
+
+
+def _combine_projects(
+    projects: List[Project],
+) -> Tuple[PieceCounts, Dict[Tuple[str, float], _Claims]]:
+    """Merge every project's pieces into one grouped order.
+
+    Also records, per wood type and length, which projects asked for how
+    many pieces, in project order, so placements can be handed back.
+    """
+    piece_counts: PieceCounts = defaultdict(lambda: defaultdict(int))
+    claims: Dict[Tuple[str, float], _Claims] = defaultdict(deque)
+    for project in projects:
+        for piece in project.pieces:
+            piece_counts[piece.type][piece.length] += piece.count
+            claims[(piece.type, piece.length)].append([project.name, piece.count])
+    return piece_counts, claims
+
+
+def calculate_consolidated_arrangement(
+    projects: List[Project], settings: Settings
+) -> ConsolidatedResult:
+    """Pack several projects' pieces together so they share units.
+
+    All projects are solved as one order per wood type, with the configured
+    packing strategy and improvement pass. Every placement is then tagged
+    with its source project. Each wood type's units and cost are split
+    between the projects in proportion to the length they use of it over
+    the whole order, so equal cut lists pay equal shares wherever their
+    pieces ended up.
+    """
+    names = [project.name for project in projects]
+    duplicates = sorted(name for name, count in Counter(names).items() if count > 1)
+    if duplicates:
+        raise ValueError(f"Duplicate project names: {duplicates}")
+
+    piece_counts, claims = _combine_projects(projects)
+    result = calculate_grouped_arrangement(piece_counts, settings)
+
+    pieces = dict.fromkeys(names, 0)
+    used: Dict[str, Dict[str, float]] = {name: defaultdict(float) for name in names}
+
+    for arr in result.arrangements:
+        wood_type = arr.wood_type
+        for unit in arr.units:
+            for position in unit.positions:
+                owners = claims[(wood_type, position.length)]
+                name = owners[0][0]
+                owners[0][1] -= 1
+                if owners[0][1] == 0:
+                    owners.popleft()
+                position.project = name
+                used[name][wood_type] += position.length
+                pieces[name] += 1
+
+    type_used: Dict[str, float] = defaultdict(float)
+    for lengths in used.values():
+        for wood_type, length in lengths.items():
+            type_used[wood_type] += length
+
+    units: Dict[str, Dict[str, float]] = {name: {} for name in names}
+    costs: Dict[str, Dict[str, float]] = {name: {} for name in names}
+    for name, lengths in used.items():
+        for wood_type, length in lengths.items():
+            share = length / type_used[wood_type]
+            units[name][wood_type] = share * result.total_units[wood_type]
+            costs[name][wood_type] = share * result.costs[wood_type]
+
+    shares = {
+        name: ProjectShare(
+            pieces=pieces[name],
+            units=units[name],
+            costs=costs[name],
+            total_cost=sum(costs[name].values()),
+        )
+        for name in names
+    }
+    return ConsolidatedResult(result=result, projects=shares)
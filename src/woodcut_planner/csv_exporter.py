@@ -3,6 +3,14 @@ from typing import List, Dict, Any
 from .models import WoodPiece, Settings, CalculationResult
 
 
+def _unit_size(settings: Settings, wood_type: str) -> str:
+    """Unit length of a wood type, or "<width>x<height>" of a sheet type."""
+    if wood_type in settings.sheet_types:
+        sheet = settings.sheet_types[wood_type]
+        return f"{sheet.width:g}x{sheet.height:g}"
+    return settings.wood_types[wood_type].unit_length
+
+
 def generate_purchase_order(
     result: CalculationResult, settings: Settings
 ) -> List[List[str]]:
@@ -20,9 +28,9 @@ def generate_purchase_order(
     )
 
     for wood_type, units in result.total_units.items():
-        unit_length = settings.wood_types[wood_type].unit_length
+        unit_length = _unit_size(settings, wood_type)
         total_cost = result.costs[wood_type]
-        cost_per_unit = settings.wood_types[wood_type].price
+        cost_per_unit = settings.unit_price(wood_type)
         csv_data.append(
             [
                 wood_type,
@@ -67,6 +75,24 @@ def generate_arrangements(
                         ]
                     )
 
+    # Sheet pieces are labelled "<width>x<height>" and placed at "x,y"
+    for sheet_arr in result.sheet_arrangements:
+        for sheet_unit in sheet_arr.units:
+            for placement in sheet_unit.placements:
+                if placement.rotated:
+                    size = f"{placement.height:g}x{placement.width:g}"
+                else:
+                    size = f"{placement.width:g}x{placement.height:g}"
+                csv_data.append(
+                    [
+                        sheet_arr.wood_type,
+                        sheet_unit.unit_number,
+                        size,
+                        sheet_unit.pieces[size],
+                        f"{placement.x:.1f},{placement.y:.1f}",
+                    ]
+                )
+
     return csv_data
 
 
@@ -94,9 +120,7 @@ def generate_waste_analysis(
     csv_data.append(["Wood Type", "Total Waste (cm)", "Waste %", "Suggestion"])
     for wood_type in stats.waste_by_type:
         type_waste = stats.waste_by_type[wood_type]
-        type_total = (
-            result.total_units[wood_type] * settings.wood_types[wood_type].unit_length
-        )
+        type_total = result.total_units[wood_type] * settings.unit_capacity(wood_type)
         waste_percentage = (type_waste / type_total) * 100
         csv_data.append(
             [
@@ -151,4 +175,20 @@ def generate_cutting_plan(
                 csv_data.append(["", "", f"Remaining: {unit.waste:.1f}cm"])
             csv_data.append([])
 
+    for sheet_arr in result.sheet_arrangements:
+        wood_type = sheet_arr.wood_type
+        sheet_size = _unit_size(settings, wood_type)
+
+        csv_data.append([])
+        csv_data.append([f"{wood_type} (Sheet Size: {sheet_size}cm)"])
+        csv_data.append([])
+
+        for sheet_unit in sheet_arr.units:
+            csv_data.append([wood_type, f"Sheet {sheet_unit.unit_number}:"])
+            for size, count in sorted(sheet_unit.pieces.items()):
+                csv_data.append(["", "", f"{count}x {size}cm"])
+            if sheet_unit.waste > 0:
+                csv_data.append(["", "", f"Remaining: {sheet_unit.waste:.1f}cm²"])
+            csv_data.append([])
+
     return csv_data
@@ -0,0 +1,247 @@
+import csv
+import json
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+from pydantic import Field, PositiveFloat, TypeAdapter, ValidationError
+from typing_extensions import Annotated, NotRequired, TypedDict
+
+from .models import WoodPiece
+from .calculator import PieceCounts, group_pieces
+from .binary_format import SUFFIX as BINARY_SUFFIX, read_binary_pieces
+
+# Records validated per TypeAdapter call
+BATCH_SIZE = 10_000
+# Errors listed in the message before the rest are only counted
+MAX_REPORTED_ERRORS = 20
+
+_Count = Annotated[int, Field(ge=1)]
+
+
+class _PieceRecord(TypedDict):
+    """A piece as written in a JSON file, mirroring the WoodPiece fields."""
+
+    type: str
+    length: PositiveFloat
+    count: NotRequired[_Count]
+
+
+_records_adapter = TypeAdapter(List[_PieceRecord])
+_types_adapter = TypeAdapter(List[str])
+_lengths_adapter = TypeAdapter(List[PositiveFloat])
+_counts_adapter = TypeAdapter(List[_Count])
+
+# (type, length, count) of a validated record
+PieceTriple = Tuple[str, float, int]
+# (line number, message) of an invalid record
+LineError = Tuple[int, str]
+
+
+def _record_errors(
+    error: ValidationError, line_numbers: List[int], location: str
+) -> List[LineError]:
+    """Turn a bulk validation error into line-numbered messages."""
+    errors = []
+    for detail in error.errors():
+        line_number = line_numbers[detail["loc"][0]]
+        field = ".".join(str(part) for part in detail["loc"][1:])
+        prefix = f"{location} {line_number}: " + (f"{field}: " if field else "")
+        errors.append((line_number, prefix + detail["msg"]))
+    return errors
+
+
+def _validate_records(
+    records: List[Any], line_numbers: List[int], location: str, errors: List[LineError]
+) -> Iterator[PieceTriple]:
+    """Validate a batch of decoded JSON records in one call."""
+    try:
+        valid = _records_adapter.validate_python(records)
+    except ValidationError as e:
+        errors.extend(_record_errors(e, line_numbers, location))
+        return
+    for record in valid:
+        yield record["type"], record["length"], record.get("count", 1)
+
+
+def _read_json(path: Path, errors: List[LineError]) -> Iterator[PieceTriple]:
+    """Read a JSON array of pieces, numbering items from 1."""
+    with open(path) as f:
+        records = json.load(f)
+    if not isinstance(records, list):
+        raise ValueError(f"{path}: expected a JSON array of pieces")
+    for start in range(0, len(records), BATCH_SIZE):
+        batch = records[start : start + BATCH_SIZE]
+        line_numbers = list(range(start + 1, start + len(batch) + 1))
+        yield from _validate_records(batch, line_numbers, "item", errors)
+
+
+def _read_json_lines(path: Path, errors: List[LineError]) -> Iterator[PieceTriple]:
+    """Stream a JSON-lines cut list with one piece object per line.
+
+    Each batch of lines is parsed and validated by pydantic-core as a single
+    JSON array. A batch that fails, or that parses into a different number of
+    records than it has lines (a line holding two objects), is decoded line
+    by line instead, so every line is judged on its own.
+    """
+    with open(path) as f:
+        numbered = ((n, line) for n, line in enumerate(f, 1) if line.strip())
+        while True:
+            batch = list(islice(numbered, BATCH_SIZE))
+            if not batch:
+                return
+            try:
+                valid = _records_adapter.validate_json(
+                    "[" + ",".join(line for _, line in batch) + "]"
+                )
+            except ValidationError:
+                valid = None
+            if valid is None or len(valid) != len(batch):
+                yield from _read_lines_one_by_one(batch, errors)
+                continue
+            for record in valid:
+                yield record["type"], record["length"], record.get("count", 1)
+
+
+def _read_lines_one_by_one(
+    batch: List[Tuple[int, str]], errors: List[LineError]
+) -> Iterator[PieceTriple]:
+    """Decode and validate JSON lines separately, collecting errors by line."""
+    records, decoded_lines = [], []
+    for line_number, line in batch:
+        try:
+            records.append(json.loads(line))
+            decoded_lines.append(line_number)
+        except json.JSONDecodeError as e:
+            errors.append((line_number, f"line {line_number}: invalid JSON: {e.msg}"))
+    yield from _validate_records(records, decoded_lines, "line", errors)
+
+
+def _validate_column(
+    adapter: TypeAdapter,
+    values: List[Any],
+    field: str,
+    line_numbers: List[int],
+    errors: List[LineError],
+) -> List[Any]:
+    """Validate one CSV column in bulk, collecting errors by line."""
+    try:
+        return adapter.validate_python(values)
+    except ValidationError as e:
+        for detail in e.errors():
+            line_number = line_numbers[detail["loc"][0]]
+            errors.append(
+                (line_number, f"line {line_number}: {field}: {detail['msg']}")
+            )
+        return []
+
+
+def _read_csv_columns(
+    line_numbers: List[int],
+    types: List[str],
+    lengths: List[str],
+    counts: List[Any],
+    errors: List[LineError],
+) -> Iterable[PieceTriple]:
+    """Validate a batch of CSV columns."""
+    types = _validate_column(_types_adapter, types, "type", line_numbers, errors)
+    lengths = _validate_column(
+        _lengths_adapter, lengths, "length", line_numbers, errors
+    )
+    counts = _validate_column(_counts_adapter, counts, "count", line_numbers, errors)
+    if len(types) == len(lengths) == len(counts):
+        return zip(types, lengths, counts)
+    return ()
+
+
+def _read_csv(path: Path, errors: List[LineError]) -> Iterator[PieceTriple]:
+    """Stream a CSV cut list with a header row naming type, length and count.
+
+    Rows are gathered into columns and each column is validated in bulk. A
+    UTF-8 byte-order mark, as spreadsheet exports write, is skipped.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = [name.strip().lower() for name in next(reader, [])]
+        if "type" not in header or "length" not in header:
+            raise ValueError(f"{path}: CSV header must include 'type' and 'length'")
+        type_index = header.index("type")
+        length_index = header.index("length")
+        count_index = header.index("count") if "count" in header else None
+
+        line_numbers: List[int] = []
+        types: List[str] = []
+        lengths: List[str] = []
+        counts: List[Any] = []
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < len(header):
+                row += [""] * (len(header) - len(row))
+            line_numbers.append(reader.line_num)
+            types.append(row[type_index].strip())
+            lengths.append(row[length_index])
+            # Blank counts fall back to the WoodPiece default of 1
+            count = row[count_index].strip() if count_index is not None else ""
+            counts.append(count or 1)
+            if len(line_numbers) == BATCH_SIZE:
+                yield from _read_csv_columns(
+                    line_numbers, types, lengths, counts, errors
+                )
+                line_numbers, types, lengths, counts = [], [], [], []
+        yield from _read_csv_columns(line_numbers, types, lengths, counts, errors)
+
+
+def load_pieces(pieces_file: Union[str, Path]) -> List[WoodPiece]:
+    """Load pieces from a JSON, JSON-lines, CSV or binary cut list file.
+
+    JSON-lines (``.jsonl``/``.ndjson``) and CSV files are streamed and
+    validated in bulk, a batch at a time. Records with the same type and
+    length are merged into a single piece with the summed count, so memory
+    grows with the number of distinct pieces rather than the number of lines.
+    Raises ValueError listing the line number of every invalid record.
+    """
+    path = Path(pieces_file)
+    suffix = path.suffix.lower()
+    if suffix == BINARY_SUFFIX:
+        return [
+            WoodPiece(type=wood_type, length=length, count=count)
+            for wood_type, lengths in read_binary_pieces(path).items()
+            for length, count in lengths.items()
+        ]
+    if suffix == ".csv":
+        reader = _read_csv
+    elif suffix in (".jsonl", ".ndjson"):
+        reader = _read_json_lines
+    else:
+        reader = _read_json
+
+    counts: Dict[Tuple[str, float], int] = {}
+    errors: List[LineError] = []
+    for wood_type, length, count in reader(path, errors):
+        key = (wood_type, length)
+        counts[key] = counts.get(key, 0) + count
+
+    if errors:
+        errors.sort()
+        message = "\n".join(message for _, message in errors[:MAX_REPORTED_ERRORS])
+        if len(errors) > MAX_REPORTED_ERRORS:
+            message += f"\n... and {len(errors) - MAX_REPORTED_ERRORS} more errors"
+        raise ValueError(f"Invalid pieces in {path}:\n{message}")
+
+    return [
+        WoodPiece(type=wood_type, length=length, count=count)
+        for (wood_type, length), count in counts.items()
+    ]
+
+
+def load_piece_counts(pieces_file: Union[str, Path]) -> PieceCounts:
+    """Load a pieces file as the calculator's grouped piece counts.
+
+    Binary cut lists are already grouped and go straight through, without
+    building a WoodPiece per record.
+    """
+    path = Path(pieces_file)
+    if path.suffix.lower() == BINARY_SUFFIX:
+        return read_binary_pieces(path)
+    return group_pieces(load_pieces(path))
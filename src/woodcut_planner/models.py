@@ -1,5 +1,13 @@
-from typing import Dict, List
-from pydantic import BaseModel, Field, NonNegativeFloat, PositiveFloat
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import (
+    BaseModel,
+    Field,
+    NonNegativeFloat,
+    NonNegativeInt,
+    PositiveFloat,
+    PositiveInt,
+    model_validator,
+)
 
 
 class WoodType(BaseModel):
@@ -13,15 +21,97 @@ class WoodPiece(BaseModel):
     count: int = Field(default=1, ge=1)
 
 
+class SheetType(BaseModel):
+    width: PositiveFloat  # cm
+    height: PositiveFloat  # cm
+    price: NonNegativeFloat
+
+
+class SheetPiece(BaseModel):
+    type: str
+    width: PositiveFloat
+    height: PositiveFloat
+    count: int = Field(default=1, ge=1)
+    rotatable: bool = Field(default=True)  # False keeps the grain direction
+
+
+class ColumnarPieces(BaseModel):
+    """Pieces as parallel arrays, with wood types dictionary-encoded.
+
+    Row ``i`` is ``counts[i]`` pieces of ``types[type_ids[i]]`` cut to
+    ``lengths[i]``. Counts default to 1 for every row when omitted.
+    """
+
+    types: List[str]
+    type_ids: List[NonNegativeInt]
+    lengths: List[PositiveFloat]
+    counts: Optional[List[PositiveInt]] = None
+
+    @model_validator(mode="after")
+    def check_columns(self) -> "ColumnarPieces":
+        if len(self.type_ids) != len(self.lengths):
+            raise ValueError("type_ids and lengths must have the same length")
+        if self.counts is not None and len(self.counts) != len(self.lengths):
+            raise ValueError("counts and lengths must have the same length")
+        if self.type_ids and max(self.type_ids) >= len(self.types):
+            raise ValueError("type_ids must index into types")
+        return self
+
+    def to_piece_counts(self) -> Dict[str, Dict[float, int]]:
+        """Group the rows by wood type and length, summing their counts."""
+        by_id: List[Dict[float, int]] = [{} for _ in self.types]
+        counts = self.counts if self.counts is not None else [1] * len(self.lengths)
+        for type_id, length, count in zip(self.type_ids, self.lengths, counts):
+            lengths = by_id[type_id]
+            lengths[length] = lengths.get(length, 0) + count
+        piece_counts: Dict[str, Dict[float, int]] = {}
+        for wood_type, lengths in zip(self.types, by_id):
+            if lengths:
+                type_lengths = piece_counts.setdefault(wood_type, {})
+                for length, count in lengths.items():
+                    type_lengths[length] = type_lengths.get(length, 0) + count
+        return piece_counts
+
+
 class Settings(BaseModel):
     wood_types: Dict[str, WoodType]
     saw_width: NonNegativeFloat = Field(default=0.3)  # cm
     currency: str = Field(default=" ILS")
+    packing_strategy: Literal["first_fit_decreasing", "subset_sum"] = Field(
+        default="first_fit_decreasing"
+    )
+    improvement_time_limit: NonNegativeFloat = Field(default=0)  # seconds, 0 = off
+    improvement_max_iterations: int = Field(default=10000, ge=0)
+    sheet_types: Dict[str, SheetType] = Field(default_factory=dict)
+    collect_diagnostics: bool = Field(default=False)  # fill result.diagnostics
+
+    @model_validator(mode="after")
+    def check_type_names(self) -> "Settings":
+        shared = set(self.wood_types) & set(self.sheet_types)
+        if shared:
+            raise ValueError(
+                f"Types defined as both wood and sheet types: {sorted(shared)}"
+            )
+        return self
+
+    def unit_capacity(self, wood_type: str) -> float:
+        """Length of a wood unit, or area of a sheet, of the given type."""
+        if wood_type in self.sheet_types:
+            sheet = self.sheet_types[wood_type]
+            return sheet.width * sheet.height
+        return self.wood_types[wood_type].unit_length
+
+    def unit_price(self, wood_type: str) -> float:
+        """Price of one wood unit or sheet of the given type."""
+        if wood_type in self.sheet_types:
+            return self.sheet_types[wood_type].price
+        return self.wood_types[wood_type].price
 
 
 class PiecePlacement(BaseModel):
     length: PositiveFloat
     start_position: NonNegativeFloat
+    project: Optional[str] = None  # source project in a consolidated solve
 
 
 class WoodUnit(BaseModel):
@@ -36,6 +126,26 @@ class WoodArrangement(BaseModel):
     units: List[WoodUnit]
 
 
+class SheetPlacement(BaseModel):
+    width: PositiveFloat  # as placed, after any rotation
+    height: PositiveFloat
+    x: NonNegativeFloat
+    y: NonNegativeFloat
+    rotated: bool = Field(default=False)
+
+
+class SheetUnit(BaseModel):
+    unit_number: int
+    pieces: Dict[str, int]  # "<width>x<height>" -> count
+    placements: List[SheetPlacement]
+    waste: NonNegativeFloat  # cm²
+
+
+class SheetArrangement(BaseModel):
+    wood_type: str
+    units: List[SheetUnit]
+
+
 class WasteStatistics(BaseModel):
     """Statistics about waste in the cutting arrangement."""
 
@@ -45,10 +155,31 @@ class WasteStatistics(BaseModel):
     waste_percentage: NonNegativeFloat
     waste_distribution: Dict[
         str, List[NonNegativeFloat]
-    ]  # wood_type -> list of waste lengths
+    ]  # wood_type -> list of waste lengths (areas for sheets)
     potential_savings: Dict[str, str]  # wood_type -> saving suggestion
 
 
+class TypeDiagnostics(BaseModel):
+    """Solver counters for one wood type."""
+
+    pieces: NonNegativeInt
+    fit_attempts: NonNegativeInt  # tries to place a piece in a unit
+    failed_fits: NonNegativeInt
+    units_scanned: NonNegativeInt  # units looked at, over all pieces
+    max_units_scanned: NonNegativeInt  # most units looked at for one piece
+    units_opened: NonNegativeInt
+    pack_seconds: NonNegativeFloat
+    improve_seconds: NonNegativeFloat
+
+
+class Diagnostics(BaseModel):
+    """Where a calculation spent its effort, when collect_diagnostics is set."""
+
+    by_type: Dict[str, TypeDiagnostics]
+    statistics_seconds: NonNegativeFloat
+    total_seconds: NonNegativeFloat
+
+
 class CalculationResult(BaseModel):
     arrangements: List[WoodArrangement]
     total_units: Dict[str, int]
@@ -56,3 +187,67 @@ class CalculationResult(BaseModel):
     total_cost: float
     waste_statistics: WasteStatistics
     currency: str = Field(default="ILS")
+    units_saved: Dict[str, int] = Field(default_factory=dict)  # by local search
+    sheet_arrangements: List[SheetArrangement] = Field(default_factory=list)
+    plan_id: Optional[str] = None  # content hash of the API request
+    diagnostics: Optional[Diagnostics] = None
+
+
+class Project(BaseModel):
+    """One job's pieces in a consolidated solve."""
+
+    name: str
+    pieces: List[WoodPiece]
+
+
+class ProjectShare(BaseModel):
+    """What a project is charged for in a consolidated solve.
+
+    Each wood type's units and cost are split between the projects in
+    proportion to the length they use of it, so shares add up to the totals.
+    """
+
+    pieces: NonNegativeInt
+    units: Dict[str, NonNegativeFloat]  # wood_type -> share of units
+    costs: Dict[str, NonNegativeFloat]  # wood_type -> share of cost
+    total_cost: NonNegativeFloat
+
+
+class ConsolidatedResult(BaseModel):
+    result: CalculationResult
+    projects: Dict[str, ProjectShare]
+
+
+class SettingsVariant(BaseModel):
+    """One what-if scenario: dotted settings paths and their new values.
+
+    Paths name a Settings field (``saw_width``) or a wood type's field
+    (``wood_types.<name>.unit_length``); ``wood_types`` replaces the whole
+    catalogue, e.g. with another supplier's price list.
+    """
+
+    name: Optional[str] = None
+    overrides: Dict[str, Any] = Field(default_factory=dict)
+
+
+class SweepScenario(BaseModel):
+    name: str
+    overrides: Dict[str, Any]
+    total_units: Dict[str, int]
+    units: NonNegativeInt
+    total_cost: NonNegativeFloat
+    total_waste: NonNegativeFloat
+    waste_percentage: NonNegativeFloat
+
+
+class SweepResult(BaseModel):
+    scenarios: List[SweepScenario]
+    solves: NonNegativeInt  # distinct packings solved for all scenarios
+
+
+class FinishedBoard(BaseModel):
+    """A unit the online packer will add no more pieces to, ready to cut."""
+
+    wood_type: str
+    unit: WoodUnit
+    reason: Literal["full", "window", "flush"]  # why it was finished
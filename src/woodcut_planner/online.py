@@ -0,0 +1,158 @@
+import json
+from typing import Dict, List, Optional
+
+from .models import WoodPiece, Settings, FinishedBoard
+from .calculator import _build_unit
+
+# Open units kept per wood type unless told otherwise
+DEFAULT_WINDOW = 16
+
+
+class _OpenUnit:
+    """A unit still accepting pieces: where the next cut starts, and what it holds."""
+
+    __slots__ = ("end", "lengths")
+
+    def __init__(self) -> None:
+        self.end = 0.0
+        self.lengths: List[float] = []
+
+
+class OnlinePacker:
+    """Pack pieces as they arrive, holding only a window of open units.
+
+    Each piece goes into the open unit of its wood type with the least room
+    that still fits it (best fit). When none fits, a new unit is opened, and
+    if the window is already full the fullest open unit is finished first.
+    A unit is also finished as soon as no piece of at least ``min_length``
+    fits in it any more; by default only once not even a saw cut fits.
+    Callers that know their shortest piece can pass it to get boards out
+    sooner. Memory stays bounded by the window, whatever the length of the
+    stream.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        window: int = DEFAULT_WINDOW,
+        min_length: float = 0.0,
+    ) -> None:
+        if window < 1:
+            raise ValueError("Window must hold at least one open unit")
+        self.settings = settings
+        self.window = window
+        self.min_length = min_length
+        self._open: Dict[str, List[_OpenUnit]] = {}
+        self.total_units: Dict[str, int] = {}
+
+    def _finish(self, wood_type: str, unit: _OpenUnit, reason: str) -> FinishedBoard:
+        self._open[wood_type].remove(unit)
+        number = self.total_units.get(wood_type, 0) + 1
+        self.total_units[wood_type] = number
+        built = _build_unit(
+            number,
+            unit.lengths,
+            self.settings.wood_types[wood_type].unit_length,
+            self.settings.saw_width,
+        )
+        return FinishedBoard(wood_type=wood_type, unit=built, reason=reason)
+
+    def add(self, piece: WoodPiece) -> List[FinishedBoard]:
+        """Place every copy of a piece, returning the boards it finished."""
+        wood_type = piece.type
+        if wood_type not in self.settings.wood_types:
+            raise ValueError(f"Unknown wood type: {wood_type}")
+        unit_length = self.settings.wood_types[wood_type].unit_length
+        saw_width = self.settings.saw_width
+        if piece.length > unit_length:
+            raise ValueError(f"Piece {piece} too long for unit length {unit_length}")
+
+        open_units = self._open.setdefault(wood_type, [])
+        finished = []
+
+        for _ in range(piece.count):
+            best = None
+            best_room = unit_length
+            for unit in open_units:
+                start = unit.end + saw_width if unit.lengths else 0.0
+                left = unit_length - start - piece.length
+                if left >= 0 and (best is None or left < best_room):
+                    best, best_room = unit, left
+            if best is None:
+                if len(open_units) >= self.window:
+                    fullest = max(open_units, key=lambda unit: unit.end)
+                    finished.append(self._finish(wood_type, fullest, "window"))
+                best = _OpenUnit()
+                open_units.append(best)
+
+            start = best.end + saw_width if best.lengths else 0.0
+            best.end = start + piece.length
+            best.lengths.append(piece.length)
+            room = unit_length - best.end - saw_width
+            if room <= 0 or room < self.min_length:
+                finished.append(self._finish(wood_type, best, "full"))
+
+        return finished
+
+    def flush(self, wood_type: Optional[str] = None) -> List[FinishedBoard]:
+        """Finish every open unit, or only those of one wood type."""
+        types = [wood_type] if wood_type is not None else list(self._open)
+        finished = []
+        for name in types:
+            for unit in list(self._open.get(name, [])):
+                finished.append(self._finish(name, unit, "flush"))
+        return finished
+
+    def open_units(self) -> int:
+        return sum(len(units) for units in self._open.values())
+
+    def summary(self) -> dict:
+        """Boards finished so far and what they cost."""
+        costs = {
+            wood_type: units * self.settings.wood_types[wood_type].price
+            for wood_type, units in self.total_units.items()
+        }
+        return {
+            "event": "summary",
+            "total_units": dict(self.total_units),
+            "costs": costs,
+            "total_cost": sum(costs.values()),
+            "open_units": self.open_units(),
+        }
+
+    def handle_line(self, line: str, line_number: int) -> List[dict]:
+        """Handle one NDJSON input line, returning the output events.
+
+        A line is either a piece object or ``{"command": "flush"}``, with an
+        optional ``"type"`` to flush one wood type. Invalid lines produce an
+        error event rather than stopping the stream.
+        """
+        if not line.strip():
+            return []
+        try:
+            record = json.loads(line)
+            if isinstance(record, dict) and "command" in record:
+                if record["command"] != "flush":
+                    raise ValueError(f"unknown command {record['command']!r}")
+                wood_type = record.get("type")
+                if wood_type is not None and (
+                    not isinstance(wood_type, str)
+                    or wood_type not in self.settings.wood_types
+                ):
+                    raise ValueError(f"Unknown wood type: {wood_type!r}")
+                boards = self.flush(wood_type)
+            else:
+                boards = self.add(WoodPiece.model_validate(record))
+        except ValueError as e:
+            return [{"event": "error", "line": line_number, "detail": str(e)}]
+        return [board_event(board) for board in boards]
+
+    def finish(self) -> List[dict]:
+        """Flush everything at the end of the input and summarize."""
+        events = [board_event(board) for board in self.flush()]
+        events.append(self.summary())
+        return events
+
+
+def board_event(board: FinishedBoard) -> dict:
+    return {"event": "board", **board.model_dump()}
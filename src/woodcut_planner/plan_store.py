@@ -0,0 +1,118 @@
+import hashlib
+import json
+import sqlite3
+import time
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional, Tuple, Union
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS plans (
+        id TEXT PRIMARY KEY,
+        request TEXT NOT NULL,
+        result TEXT NOT NULL,
+        created REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS plans_created ON plans (created)",
+)
+
+# Plans kept by default, and how long for
+DEFAULT_MAX_PLANS = 10_000
+DEFAULT_MAX_AGE = 30 * 24 * 3600.0
+
+
+def plan_id(request: Any) -> str:
+    """Content hash of a JSON-compatible request.
+
+    Keys are sorted and whitespace dropped, so equal requests always hash
+    to the same id however they were written.
+    """
+    canonical = json.dumps(request, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+
+def result_digest(result_json: str) -> str:
+    """Content hash of a stored result, for ETags that follow its bytes."""
+    return hashlib.sha256(result_json.encode()).hexdigest()[:16]
+
+
+class PlanStore:
+    """Calculated plans in a SQLite file, keyed by the request's content hash.
+
+    A plan never changes once stored, so anything derived from it can be
+    cached for good. Each call opens its own connection, which keeps the
+    store safe to share between threads and worker processes. An empty
+    path disables the store: nothing is kept and every lookup misses.
+
+    Storing a plan first drops plans older than ``max_age`` seconds, then
+    the oldest ones beyond ``max_plans``. Either limit can be None to keep
+    plans regardless.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_plans: Optional[int] = DEFAULT_MAX_PLANS,
+        max_age: Optional[float] = DEFAULT_MAX_AGE,
+    ) -> None:
+        if max_plans is not None and max_plans < 1:
+            raise ValueError("The plan store must keep at least one plan")
+        self.path = str(path)
+        self.enabled = bool(self.path)
+        self.max_plans = max_plans
+        self.max_age = max_age
+        self._ready = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """A connection that commits on success and is always closed."""
+        if not self._ready:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(self.path)) as connection:
+            with connection:
+                if not self._ready:
+                    for statement in _SCHEMA:
+                        connection.execute(statement)
+                    self._ready = True
+                yield connection
+
+    def get(self, plan_id: str) -> Optional[Tuple[str, str]]:
+        """The stored request and result JSON of a plan, if any."""
+        if not self.enabled:
+            return None
+        with self._connect() as connection:
+            return connection.execute(
+                "SELECT request, result FROM plans WHERE id = ?", (plan_id,)
+            ).fetchone()
+
+    def contains(self, plan_id: str) -> bool:
+        if not self.enabled:
+            return False
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT 1 FROM plans WHERE id = ?", (plan_id,)
+            ).fetchone()
+        return row is not None
+
+    def put(self, plan_id: str, request_json: str, result_json: str) -> None:
+        """Store a plan. The first plan stored under an id is kept."""
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._connect() as connection:
+            if self.max_age is not None:
+                connection.execute(
+                    "DELETE FROM plans WHERE created < ?", (now - self.max_age,)
+                )
+            connection.execute(
+                "INSERT OR IGNORE INTO plans VALUES (?, ?, ?, ?)",
+                (plan_id, request_json, result_json, now),
+            )
+            if self.max_plans is not None:
+                connection.execute(
+                    "DELETE FROM plans WHERE id IN (SELECT id FROM plans"
+                    " ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                    (self.max_plans,),
+                )
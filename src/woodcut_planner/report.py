@@ -0,0 +1,189 @@
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from tabulate import tabulate
+
+from .models import Settings, CalculationResult, WoodArrangement, Diagnostics
+
+# How much of each wood type's units the report shows
+REPORT_MODES = ("full", "patterns", "summary")
+
+# Pieces of a unit as (length, count), longest first
+_Pattern = Tuple[Tuple[float, int], ...]
+
+
+def _separator(char: str = "=", length: int = 50) -> str:
+    return char * length
+
+
+def format_currency(amount: float, currency: str) -> str:
+    return f"{amount:.2f}{currency}"
+
+
+def format_percentage(value: float) -> str:
+    return f"{value:.1f}%"
+
+
+def _unit_lines(arr: WoodArrangement, limit: Optional[int]) -> List[str]:
+    """Every unit with its pieces and waste, up to ``limit`` units."""
+    units = arr.units if limit is None else arr.units[:limit]
+    lines = []
+    for unit in units:
+        lines.append(f"  Unit {unit.unit_number}")
+        lines.append(_separator("-", 30))
+        lines.append("  Pieces:")
+        for length, count in unit.pieces.items():
+            lines.append(f"    - {count}x {length}cm")
+        lines.append(f"  Waste: {unit.waste:.1f}cm")
+        lines.append(_separator("-", 30))
+        lines.append("")
+    if len(units) < len(arr.units):
+        lines.append(f"  ... {len(arr.units) - len(units)} more units")
+        lines.append("")
+    return lines
+
+
+def _pattern_lines(arr: WoodArrangement, limit: Optional[int]) -> List[str]:
+    """Units grouped by identical cuts, most common first."""
+    patterns: Counter = Counter()
+    waste = {}
+    for unit in arr.units:
+        pattern: _Pattern = tuple(sorted(unit.pieces.items(), reverse=True))
+        patterns[pattern] += 1
+        waste[pattern] = unit.waste
+
+    ranked = patterns.most_common(limit)
+    lines = []
+    for pattern, count in ranked:
+        cuts = ", ".join(f"{pieces}x {length}cm" for length, pieces in pattern)
+        lines.append(f"  {count}x unit: {cuts} (waste {waste[pattern]:.1f}cm)")
+    if len(ranked) < len(patterns):
+        lines.append(f"  ... {len(patterns) - len(ranked)} more patterns")
+    lines.append("")
+    return lines
+
+
+def render_report(
+    result: CalculationResult,
+    settings: Settings,
+    mode: str = "full",
+    limit: Optional[int] = None,
+) -> str:
+    """Render the calculate report as a single string.
+
+    ``mode`` is ``full`` to list every unit, ``patterns`` to list each
+    distinct set of cuts once with the number of units cut that way, or
+    ``summary`` to skip units altogether. ``limit`` caps the units or
+    patterns listed per wood type, so the report's size does not grow with
+    the order.
+    """
+    if mode not in REPORT_MODES:
+        raise ValueError(f"Unknown report mode: {mode}")
+
+    lines = ["", "Wood Cutting Arrangement", _separator(), ""]
+    summary_data = []
+
+    for arr in result.arrangements:
+        wood_type = arr.wood_type
+        units_needed = result.total_units[wood_type]
+        cost = result.costs[wood_type]
+        wood_waste = result.waste_statistics.waste_by_type[wood_type]
+        unit_length = settings.wood_types[wood_type].unit_length
+
+        summary_data.append(
+            [
+                wood_type,
+                unit_length,
+                units_needed,
+                format_currency(cost, settings.currency),
+                f"{wood_waste:.1f}cm",
+                format_percentage(wood_waste / (units_needed * unit_length) * 100),
+            ]
+        )
+
+        if mode == "summary":
+            continue
+
+        lines.append(f"Wood Type: {wood_type}")
+        lines.append(f"Unit Length: {unit_length}cm")
+        lines.append(f"Number of units needed: {units_needed}")
+        lines.append(f"Cost: {format_currency(cost, settings.currency)}")
+        lines.append(f"Total waste: {wood_waste:.1f}cm")
+        lines.append(
+            f"Suggestion: {result.waste_statistics.potential_savings[wood_type]}"
+        )
+        lines.append("")
+
+        if mode == "patterns":
+            lines.extend(_pattern_lines(arr, limit))
+        else:
+            lines.extend(_unit_lines(arr, limit))
+
+        lines.append(_separator())
+        lines.append("")
+
+    # Summary table
+    lines.extend(["", "Order Summary", _separator(), ""])
+    headers = ["Wood Type", "Unit Length (cm)", "Units", "Cost", "Waste", "Waste %"]
+    lines.append(tabulate(summary_data, headers=headers, tablefmt="grid"))
+    lines.append("")
+
+    # Waste statistics
+    stats = result.waste_statistics
+    lines.extend(["", "Waste Analysis", _separator(), ""])
+    lines.append(f"Total Wood Used: {stats.total_wood_used:.1f}cm")
+    lines.append(f"Total Waste: {stats.total_waste:.1f}cm")
+    lines.append(
+        f"Overall Waste Percentage: {format_percentage(stats.waste_percentage)}"
+    )
+    lines.append("")
+
+    lines.append("Waste Distribution by Type:")
+    for wood_type, waste_lengths in stats.waste_distribution.items():
+        if waste_lengths:
+            avg_waste = sum(waste_lengths) / len(waste_lengths)
+            max_waste = max(waste_lengths)
+            lines.append(f"  {wood_type}:")
+            lines.append(f"    Average waste per unit: {avg_waste:.1f}cm")
+            lines.append(f"    Largest waste piece: {max_waste:.1f}cm")
+    lines.append("")
+
+    lines.append(f"Total Cost: {format_currency(result.total_cost, settings.currency)}")
+    lines.append(_separator())
+    return "\n".join(lines)
+
+
+def render_diagnostics(diagnostics: Diagnostics) -> str:
+    """Render the solver counters and timings as a table."""
+    headers = [
+        "Wood Type",
+        "Pieces",
+        "Fits Tried",
+        "Failed",
+        "Scanned",
+        "Max Scan",
+        "Opened",
+        "Pack ms",
+        "Improve ms",
+    ]
+    rows = [
+        [
+            wood_type,
+            stats.pieces,
+            stats.fit_attempts,
+            stats.failed_fits,
+            stats.units_scanned,
+            stats.max_units_scanned,
+            stats.units_opened,
+            f"{stats.pack_seconds * 1000:.1f}",
+            f"{stats.improve_seconds * 1000:.1f}",
+        ]
+        for wood_type, stats in diagnostics.by_type.items()
+    ]
+    lines = ["", "Solver Diagnostics", _separator(), ""]
+    lines.append(tabulate(rows, headers=headers, tablefmt="grid"))
+    lines.append("")
+    lines.append(f"Statistics: {diagnostics.statistics_seconds * 1000:.1f}ms")
+    lines.append(f"Total: {diagnostics.total_seconds * 1000:.1f}ms")
+    lines.append(_separator())
+    return "\n".join(lines)
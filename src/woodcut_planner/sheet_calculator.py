@@ -0,0 +1,235 @@
+from bisect import bisect_left, insort
+from collections import defaultdict
+from itertools import count
+from typing import Dict, List, Optional, Tuple
+
+from .models import (
+    SheetPiece,
+    Settings,
+    CalculationResult,
+    SheetUnit,
+    SheetArrangement,
+    SheetPlacement,
+)
+from .calculator import _calculate_waste_statistics
+
+# Slack for float comparisons when fitting parts into free rectangles
+_FIT_TOLERANCE = 1e-9
+
+# A free rectangle: (area, sequence, sheet index, x, y, width, height).
+# Kept in a list sorted by area, so a lookup can skip every rectangle that is
+# too small for the part and the first fit found is the best area fit.
+_FreeRect = Tuple[float, int, int, float, float, float, float]
+
+
+def _piece_label(width: float, height: float) -> str:
+    return f"{width:g}x{height:g}"
+
+
+def _find_free_rect(
+    free_rects: List[_FreeRect], width: float, height: float, rotatable: bool
+) -> Optional[Tuple[int, bool]]:
+    """Find the smallest free rectangle holding the part, maybe rotated.
+
+    Returns the rectangle's index and whether the part is rotated in it.
+    """
+    start = bisect_left(free_rects, (width * height - _FIT_TOLERANCE,))
+    for index in range(start, len(free_rects)):
+        _, _, _, _, _, free_width, free_height = free_rects[index]
+        fits = (
+            width <= free_width + _FIT_TOLERANCE
+            and height <= free_height + _FIT_TOLERANCE
+        )
+        fits_rotated = (
+            rotatable
+            and height <= free_width + _FIT_TOLERANCE
+            and width <= free_height + _FIT_TOLERANCE
+        )
+        if fits and fits_rotated:
+            # Prefer the orientation leaving the shorter leftover side smaller
+            leftover = min(free_width - width, free_height - height)
+            leftover_rotated = min(free_width - height, free_height - width)
+            return index, leftover_rotated < leftover
+        if fits or fits_rotated:
+            return index, not fits
+    return None
+
+
+def _split_free_rect(
+    x: float,
+    y: float,
+    free_width: float,
+    free_height: float,
+    width: float,
+    height: float,
+) -> List[Tuple[float, float, float, float]]:
+    """Guillotine-split the space left after placing a part in a corner.
+
+    The cut runs along the shorter leftover axis, which keeps the larger
+    leftover rectangle as big as possible.
+    """
+    leftover_width = free_width - width
+    leftover_height = free_height - height
+    if leftover_width < leftover_height:
+        right = (x + width, y, leftover_width, height)
+        top = (x, y + height, free_width, leftover_height)
+    else:
+        right = (x + width, y, leftover_width, free_height)
+        top = (x, y + height, width, leftover_height)
+    return [
+        rect
+        for rect in (right, top)
+        if rect[2] > _FIT_TOLERANCE and rect[3] > _FIT_TOLERANCE
+    ]
+
+
+def _arrange_sheet_pieces(
+    pieces: List[SheetPiece], sheet_width: float, sheet_height: float, saw_width: float
+) -> List[SheetUnit]:
+    """Pack rectangular parts onto sheets with guillotine cuts.
+
+    Parts are placed largest first, each into the smallest free rectangle
+    across all open sheets that holds it (best area fit), and a new sheet is
+    opened when none does. Like the linear calculator, every part takes one
+    saw width on its right and top edges, and a sheet holds one extra saw
+    width in each direction since the outer edges need no cut.
+    """
+    capacity_width = sheet_width + saw_width
+    capacity_height = sheet_height + saw_width
+    parts = sorted(
+        pieces,
+        key=lambda p: (-p.width * p.height, -max(p.width, p.height)),
+    )
+
+    free_rects: List[_FreeRect] = []
+    placements: List[List[SheetPlacement]] = []
+    sequence = count()
+
+    for piece in parts:
+        width = piece.width + saw_width
+        height = piece.height + saw_width
+        choice = _find_free_rect(free_rects, width, height, piece.rotatable)
+        if choice is None:
+            # Open a new sheet
+            placements.append([])
+            insort(
+                free_rects,
+                (
+                    capacity_width * capacity_height,
+                    next(sequence),
+                    len(placements) - 1,
+                    0.0,
+                    0.0,
+                    capacity_width,
+                    capacity_height,
+                ),
+            )
+            choice = _find_free_rect(free_rects, width, height, piece.rotatable)
+            if choice is None:
+                raise ValueError(
+                    f"Piece {piece} too large for sheet size "
+                    f"{_piece_label(sheet_width, sheet_height)}"
+                )
+
+        index, rotated = choice
+        _, _, sheet, x, y, free_width, free_height = free_rects.pop(index)
+        if rotated:
+            width, height = height, width
+        placements[sheet].append(
+            SheetPlacement(
+                width=width - saw_width,
+                height=height - saw_width,
+                x=x,
+                y=y,
+                rotated=rotated,
+            )
+        )
+        for rect_x, rect_y, rect_width, rect_height in _split_free_rect(
+            x, y, free_width, free_height, width, height
+        ):
+            insort(
+                free_rects,
+                (
+                    rect_width * rect_height,
+                    next(sequence),
+                    sheet,
+                    rect_x,
+                    rect_y,
+                    rect_width,
+                    rect_height,
+                ),
+            )
+
+    units = []
+    sheet_area = sheet_width * sheet_height
+    for unit_number, sheet_placements in enumerate(placements, 1):
+        pieces_by_size: Dict[str, int] = {}
+        used_area = 0.0
+        for placement in sheet_placements:
+            if placement.rotated:
+                label = _piece_label(placement.height, placement.width)
+            else:
+                label = _piece_label(placement.width, placement.height)
+            pieces_by_size[label] = pieces_by_size.get(label, 0) + 1
+            used_area += placement.width * placement.height
+        units.append(
+            SheetUnit(
+                unit_number=unit_number,
+                pieces=pieces_by_size,
+                placements=sheet_placements,
+                waste=max(0.0, sheet_area - used_area),
+            )
+        )
+    return units
+
+
+def calculate_sheet_arrangement(
+    pieces: List[SheetPiece], settings: Settings
+) -> CalculationResult:
+    """Calculate a cutting arrangement for sheet goods such as plywood or MDF.
+
+    Sheet sizes and prices come from ``settings.sheet_types``. The result's
+    ``sheet_arrangements`` hold the sheets, and its waste statistics are in
+    cm² of sheet area.
+    """
+    # Group pieces by sheet type
+    pieces_by_type: Dict[str, List[SheetPiece]] = defaultdict(list)
+    for piece in pieces:
+        pieces_by_type[piece.type].extend([piece] * piece.count)
+
+    arrangements = []
+    total_units = {}
+    costs = {}
+    total_cost = 0
+
+    for sheet_type, type_pieces in pieces_by_type.items():
+        if sheet_type not in settings.sheet_types:
+            raise ValueError(f"Unknown sheet type: {sheet_type}")
+
+        sheet_settings = settings.sheet_types[sheet_type]
+        units = _arrange_sheet_pieces(
+            type_pieces,
+            sheet_settings.width,
+            sheet_settings.height,
+            settings.saw_width,
+        )
+
+        units_needed = len(units)
+        type_cost = units_needed * sheet_settings.price
+
+        arrangements.append(SheetArrangement(wood_type=sheet_type, units=units))
+        total_units[sheet_type] = units_needed
+        costs[sheet_type] = type_cost
+        total_cost += type_cost
+
+    # Calculate waste statistics
+    waste_statistics = _calculate_waste_statistics(arrangements, settings)
+
+    return CalculationResult(
+        arrangements=[],
+        sheet_arrangements=arrangements,
+        total_units=total_units,
+        costs=costs,
+        total_cost=total_cost,
+        waste_statistics=waste_statistics,
+    )
@@ -0,0 +1,150 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import product
+from typing import Any, Dict, List, Optional, Tuple
+
+from .models import (
+    Settings,
+    WoodUnit,
+    SettingsVariant,
+    SweepScenario,
+    SweepResult,
+)
+from .calculator import (
+    PACKING_STRATEGIES,
+    PieceCounts,
+    _build_result,
+    _check_wood_types,
+    _expand_pieces,
+    _improve_units,
+)
+
+# Everything that changes how one wood type is packed. Prices are left out,
+# so variants that only change prices share the packing.
+_PackingKey = Tuple[str, float, float, str, float, int]
+
+
+def _set_path(data: Dict[str, Any], path: str, value: Any) -> None:
+    """Set a dotted settings path such as ``wood_types.<name>.price``.
+
+    Wood type names may contain dots, so only the last dot after
+    ``wood_types.`` separates the name from the field.
+    """
+    if path.startswith("wood_types.") and path.count(".") >= 2:
+        name, field = path[len("wood_types.") :].rsplit(".", 1)
+        if name not in data["wood_types"]:
+            raise ValueError(f"Unknown wood type in override: {name}")
+        data["wood_types"][name][field] = value
+    elif "." not in path:
+        data[path] = value
+    else:
+        raise ValueError(f"Unsupported settings override: {path}")
+
+
+def apply_overrides(settings: Settings, overrides: Dict[str, Any]) -> Settings:
+    """A copy of the settings with dotted-path overrides applied and validated."""
+    data = settings.model_dump()
+    for path, value in overrides.items():
+        _set_path(data, path, value)
+    return Settings.model_validate(data)
+
+
+def expand_grid(grid: Dict[str, List[Any]]) -> List[SettingsVariant]:
+    """One variant per combination of the grid's values."""
+    if not grid:
+        return []
+    paths = list(grid)
+    return [
+        SettingsVariant(
+            name=", ".join(f"{path}={value}" for path, value in zip(paths, values)),
+            overrides=dict(zip(paths, values)),
+        )
+        for values in product(*(grid[path] for path in paths))
+    ]
+
+
+def _packing_key(wood_type: str, settings: Settings) -> _PackingKey:
+    return (
+        wood_type,
+        settings.wood_types[wood_type].unit_length,
+        settings.saw_width,
+        settings.packing_strategy,
+        settings.improvement_time_limit,
+        settings.improvement_max_iterations,
+    )
+
+
+def _pack(key: _PackingKey, lengths: Dict[float, int]) -> List[WoodUnit]:
+    """Pack one wood type for one packing key; runs in a worker process."""
+    wood_type, unit_length, saw_width, strategy, time_limit, max_iterations = key
+    units = PACKING_STRATEGIES[strategy](
+        _expand_pieces(wood_type, lengths), unit_length, saw_width
+    )
+    if time_limit > 0:
+        units, _ = _improve_units(
+            units, unit_length, saw_width, max_iterations, time_limit
+        )
+    return units
+
+
+def run_sweep(
+    piece_counts: PieceCounts,
+    settings: Settings,
+    variants: List[SettingsVariant],
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> SweepResult:
+    """Solve one cut list under many settings variants and compare them.
+
+    Each variant's overrides are applied to ``settings``. Every distinct
+    packing (wood type, unit length, saw width, strategy and improvement
+    budget) is solved once, in parallel across ``workers`` processes
+    (default: one per CPU), and shared by all variants that need it, so
+    variants differing only in price cost no extra solve. An empty variant
+    list compares the base settings alone. A long-lived ``executor`` is used
+    instead of starting a process pool for this call, as servers should.
+    """
+    variants = variants or [SettingsVariant(name="base")]
+    scenario_settings = []
+    for index, variant in enumerate(variants, 1):
+        variant_settings = apply_overrides(settings, variant.overrides)
+        _check_wood_types(piece_counts, variant_settings)
+        scenario_settings.append(
+            (variant.name or f"scenario {index}", variant_settings)
+        )
+
+    jobs: Dict[_PackingKey, Dict[float, int]] = {}
+    for _, variant_settings in scenario_settings:
+        for wood_type, lengths in piece_counts.items():
+            jobs.setdefault(_packing_key(wood_type, variant_settings), lengths)
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if executor is not None and len(jobs) > 1:
+        packed = dict(zip(jobs, executor.map(_pack, jobs, jobs.values())))
+    elif executor is None and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            packed = dict(zip(jobs, executor.map(_pack, jobs, jobs.values())))
+    else:
+        packed = {key: _pack(key, lengths) for key, lengths in jobs.items()}
+
+    scenarios = []
+    for (name, variant_settings), variant in zip(scenario_settings, variants):
+        units_by_type = {
+            wood_type: packed[_packing_key(wood_type, variant_settings)]
+            for wood_type in piece_counts
+        }
+        result = _build_result(units_by_type, variant_settings, {})
+        stats = result.waste_statistics
+        scenarios.append(
+            SweepScenario(
+                name=name,
+                overrides=variant.overrides,
+                total_units=result.total_units,
+                units=sum(result.total_units.values()),
+                total_cost=result.total_cost,
+                total_waste=stats.total_waste,
+                waste_percentage=stats.waste_percentage,
+            )
+        )
+
+    return SweepResult(scenarios=scenarios, solves=len(jobs))
@@ -0,0 +1,196 @@
+"""Per-request phase timings, reported in a ``Server-Timing`` header."""
+
+import asyncio
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Timed phases in the order a calculation goes through them
+PHASES = {
+    "parse": "CalculationRequest parsing",
+    "store": "Plan id and plan store",
+    "solve": "Packing",
+    "stats": "Waste statistics",
+    "validate": "CalculationResult validation",
+    "encode": "JSON encoding",
+}
+
+# Time not covered by a phase: routing, body decoding, middleware
+OTHER = "other"
+TOTAL = "total"
+
+_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "woodcut_timings", default=None
+)
+
+_Scope = Dict[str, Any]
+_Message = Dict[str, Any]
+_Receive = Callable[[], Awaitable[_Message]]
+_Send = Callable[[_Message], Awaitable[None]]
+_ASGIApp = Callable[[_Scope, _Receive, _Send], Awaitable[None]]
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Add the time spent in the block to a phase of the current request.
+
+    Outside a timed request this does nothing, so library calls pay only a
+    context variable lookup.
+    """
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+
+
+def server_timing_header(timings: Dict[str, float], total: float) -> str:
+    """Format phase seconds as a Server-Timing header value in milliseconds."""
+    entries = [
+        f'{name};dur={seconds * 1000:.3f};desc="{PHASES.get(name, name)}"'
+        for name, seconds in timings.items()
+    ]
+    other = max(total - sum(timings.values()), 0.0)
+    entries.append(f"{OTHER};dur={other * 1000:.3f}")
+    entries.append(f"{TOTAL};dur={total * 1000:.3f}")
+    return ", ".join(entries)
+
+
+def parse_server_timing(header: str) -> Dict[str, float]:
+    """Milliseconds per metric of a Server-Timing header value."""
+    durations = {}
+    for entry in header.split(","):
+        name, *params = (part.strip() for part in entry.split(";"))
+        if not name:
+            continue
+        durations[name] = 0.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "dur":
+                durations[name] = float(value)
+    return durations
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware adding a Server-Timing header to every HTTP response.
+
+    The header lists each phase the request went through, the time outside
+    any phase as ``other`` and the ``total`` until the response started.
+    Inside another timed request it passes through, so wrapping twice
+    reports once.
+    """
+
+    def __init__(self, app: _ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: _Scope, receive: _Receive, send: _Send) -> None:
+        if scope["type"] != "http" or _timings.get() is not None:
+            await self.app(scope, receive, send)
+            return
+
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+
+        async def send_with_timing(message: _Message) -> None:
+            if message["type"] == "http.response.start":
+                header = server_timing_header(timings, time.perf_counter() - started)
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", []),
+                        (b"server-timing", header.encode()),
+                    ],
+                }
+            await send(message)
+
+        token = _timings.set(timings)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _timings.reset(token)
+
+
+async def _replay_once(
+    app: _ASGIApp, path: str, body: bytes
+) -> Tuple[int, Dict[str, str], bytes]:
+    """POST a JSON body straight to an ASGI app, with no server or socket."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"localhost"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+    request_sent = False
+    status = 0
+    headers: Dict[str, str] = {}
+    response_body = bytearray()
+
+    async def receive() -> _Message:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return {"type": "http.disconnect"}
+
+    async def send(message: _Message) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            headers.update(
+                (name.decode().lower(), value.decode())
+                for name, value in message.get("headers", [])
+            )
+        elif message["type"] == "http.response.body":
+            response_body.extend(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, headers, bytes(response_body)
+
+
+def profile_request(
+    app: _ASGIApp, path: str, body: bytes, runs: int, warmup: int = 1
+) -> Dict[str, List[float]]:
+    """Replay a request in-process and collect its Server-Timing breakdowns.
+
+    The app is wrapped in :class:`ServerTimingMiddleware` and called
+    directly through ASGI. Returns the milliseconds of every metric, one
+    value per measured run. A response other than 2xx raises ValueError.
+    """
+    timed_app = ServerTimingMiddleware(app)
+
+    async def replay() -> Dict[str, List[float]]:
+        samples: Dict[str, List[float]] = {}
+        for run in range(warmup + runs):
+            status, headers, response_body = await _replay_once(timed_app, path, body)
+            if not 200 <= status < 300:
+                detail = response_body.decode(errors="replace")
+                try:
+                    detail = json.loads(response_body)["detail"]
+                except (ValueError, KeyError, TypeError):
+                    pass
+                raise ValueError(f"{path} answered {status}: {detail}")
+            if run < warmup:
+                continue
+            for name, ms in parse_server_timing(headers["server-timing"]).items():
+                samples.setdefault(name, []).append(ms)
+        return samples
+
+    return asyncio.run(replay())
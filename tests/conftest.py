@@ -0,0 +1,22 @@
+import pytest
+from woodcut_planner.models import Settings
+
+
+@pytest.fixture
+def make_settings():
+    """Build settings with one pine 5x10 wood type; keywords override fields."""
+
+    def make(unit_length=480, saw_width=0.3, **overrides):
+        fields = {
+            "wood_types": {"pine 5x10": {"unit_length": unit_length, "price": 50}},
+            "saw_width": saw_width,
+        }
+        fields.update(overrides)
+        return Settings(**fields)
+
+    return make
+
+
+@pytest.fixture
+def settings(make_settings):
+    return make_settings()
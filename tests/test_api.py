@@ -1,11 +1,29 @@
+import json
+from types import SimpleNamespace
+
 from fastapi.testclient import TestClient
 import pytest
+from woodcut_planner import api
 from woodcut_planner.api import app
+from woodcut_planner import plan_store as plan_store_module
+from woodcut_planner.plan_store import PlanStore
+from woodcut_planner.timing import (
+    ServerTimingMiddleware,
+    parse_server_timing,
+    profile_request,
+)
 from woodcut_planner.models import WoodPiece, Settings, WoodType
 
 client = TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def plan_store(tmp_path, monkeypatch):
+    store = PlanStore(tmp_path / "plans.sqlite3")
+    monkeypatch.setattr(api, "plan_store", store)
+    return store
+
+
 @pytest.fixture
 def sample_request():
     return {
@@ -86,3 +104,269 @@ def test_invalid_wood_type(sample_request):
     response = client.post("/api/calculate", json=sample_request)
     assert response.status_code == 400
     assert "Unknown wood type" in response.json()["detail"]
+
+
+def test_calculate_columnar(sample_request):
+    columnar_request = {
+        "columns": {
+            "types": ["pine 5x10"],
+            "type_ids": [0, 0],
+            "lengths": [250, 180],
+            "counts": [2, 1],
+        },
+        "settings": sample_request["settings"],
+    }
+
+    response = client.post("/api/calculate", json=columnar_request)
+    assert response.status_code == 200
+    columnar_result = response.json()
+    result = client.post("/api/calculate", json=sample_request).json()
+    # Both formats give the same plan, stored under different request hashes
+    assert columnar_result.pop("plan_id") != result.pop("plan_id")
+    assert columnar_result == result
+
+    response = client.post("/api/export/cutting-plan", json=columnar_request)
+    assert response.status_code == 200
+    assert response.json()["filename"] == "cutting_plan.csv"
+
+
+def test_calculate_columnar_rejects_mismatched_columns(sample_request):
+    columnar_request = {
+        "columns": {"types": ["pine 5x10"], "type_ids": [0, 1], "lengths": [250]},
+        "settings": sample_request["settings"],
+    }
+
+    response = client.post("/api/calculate", json=columnar_request)
+    assert response.status_code == 422
+
+
+def test_calculate_stream(sample_request):
+    response = client.post("/api/calculate/stream", json=sample_request)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = [
+        (block.split("\n")[0], json.loads(block.split("\n")[1][len("data: ") :]))
+        for block in response.text.strip().split("\n\n")
+    ]
+    assert events[0][0] == "event: plan"
+    assert events[0][1]["stage"] == "first_fit_decreasing"
+    assert events[-1][0] == "event: done"
+
+    plans = [data for event, data in events if event == "event: plan"]
+    costs = [plan["total_cost"] for plan in plans]
+    assert costs == sorted(costs)
+    assert events[-1][1]["units"] == plans[-1]["units"]
+    assert plans[-1]["result"]["total_units"]["pine 5x10"] == plans[-1]["units"]
+
+
+def test_calculate_stream_invalid_wood_type(sample_request):
+    sample_request["pieces"][0]["type"] = "invalid_wood"
+
+    response = client.post("/api/calculate/stream", json=sample_request)
+    assert response.status_code == 400
+
+
+def test_calculate_sheets():
+    response = client.post(
+        "/api/calculate/sheets",
+        json={
+            "pieces": [{"type": "plywood", "width": 100, "height": 50, "count": 5}],
+            "settings": {
+                "wood_types": {},
+                "sheet_types": {"plywood": {"width": 244, "height": 122, "price": 40}},
+            },
+        },
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert result["total_units"] == {"plywood": 2}
+    assert result["sheet_arrangements"][0]["wood_type"] == "plywood"
+
+
+def test_calculate_consolidated(sample_request):
+    response = client.post(
+        "/api/calculate/consolidated",
+        json={
+            "projects": [
+                {"name": "shed", "pieces": [{"type": "pine 5x10", "length": 250}]},
+                {"name": "deck", "pieces": [{"type": "pine 5x10", "length": 200}]},
+            ],
+            "settings": sample_request["settings"],
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["result"]["total_units"] == {"pine 5x10": 1}
+    assert set(data["projects"]) == {"shed", "deck"}
+    assert data["projects"]["shed"]["pieces"] == 1
+
+
+def test_calculate_returns_plan_id(sample_request, plan_store):
+    first = client.post("/api/calculate", json=sample_request).json()
+    # Same content, different key order
+    reordered = {"settings": sample_request["settings"], **sample_request}
+    second = client.post("/api/calculate", json=reordered).json()
+
+    assert first["plan_id"]
+    assert second == first
+    assert plan_store.contains(first["plan_id"])
+
+
+def test_get_plan_export_with_etag(sample_request):
+    plan_id = client.post("/api/calculate", json=sample_request).json()["plan_id"]
+    url = f"/api/plans/{plan_id}/export/cutting-plan"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.json()["filename"] == "cutting_plan.csv"
+    etag = response.headers["etag"]
+    assert etag.startswith(f'"{plan_id}.') and etag.endswith('-cutting-plan"')
+
+    cached = client.get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    plan = client.get(f"/api/plans/{plan_id}")
+    assert plan.status_code == 200
+    assert plan.json()["plan_id"] == plan_id
+
+
+def test_plan_etag_changes_when_an_evicted_plan_is_solved_differently(
+    sample_request, monkeypatch, tmp_path
+):
+    monkeypatch.setattr(api, "plan_store", PlanStore(tmp_path / "p.db", max_plans=1))
+    plan_id = client.post("/api/calculate", json=sample_request).json()["plan_id"]
+    first = client.get(f"/api/plans/{plan_id}")
+    first_export = client.get(f"/api/plans/{plan_id}/export/purchase-order")
+
+    # Another plan evicts the first, which then solves to a different result
+    other = {**sample_request, "pieces": sample_request["pieces"][:1]}
+    client.post("/api/calculate", json=other)
+    assert client.get(f"/api/plans/{plan_id}").status_code == 404
+    solve = api._calculate
+
+    def cheaper(request):
+        result = solve(request)
+        result.total_cost -= 1
+        return result
+
+    monkeypatch.setattr(api, "_calculate", cheaper)
+    client.post("/api/calculate", json=sample_request)
+
+    for url, old in (
+        (f"/api/plans/{plan_id}", first),
+        (f"/api/plans/{plan_id}/export/purchase-order", first_export),
+    ):
+        response = client.get(url, headers={"If-None-Match": old.headers["etag"]})
+        assert response.status_code == 200
+        assert response.headers["etag"] != old.headers["etag"]
+    assert client.get(f"/api/plans/{plan_id}").json()["total_cost"] == (
+        first.json()["total_cost"] - 1
+    )
+
+
+def test_get_unknown_plan():
+    assert client.get("/api/plans/missing/export/cutting-plan").status_code == 404
+    assert client.get("/api/plans/missing").status_code == 404
+    response = client.get(
+        "/api/plans/missing/export/cutting-plan",
+        headers={"If-None-Match": '"missing-cutting-plan"'},
+    )
+    assert response.status_code == 404
+
+
+def test_plan_store_creates_missing_directory(tmp_path):
+    store = PlanStore(tmp_path / "new" / "dir" / "plans.sqlite3")
+    store.put("abc", "{}", '{"ok": true}')
+
+    assert store.get("abc") == ("{}", '{"ok": true}')
+    assert store.contains("abc")
+
+
+def test_plan_store_drops_oldest_plans(tmp_path, monkeypatch):
+    store = PlanStore(tmp_path / "plans.sqlite3", max_plans=2, max_age=100)
+    clock = iter([1000.0, 1001.0, 1002.0, 1200.0])
+    monkeypatch.setattr(
+        plan_store_module, "time", SimpleNamespace(time=lambda: next(clock))
+    )
+
+    for name in ("a", "b", "c"):
+        store.put(name, "{}", "{}")
+    assert [store.contains(name) for name in "abc"] == [False, True, True]
+
+    # Too old by the time the next plan is stored
+    store.put("d", "{}", "{}")
+    assert [store.contains(name) for name in "bcd"] == [False, False, True]
+
+
+def test_disabled_plan_store(sample_request, monkeypatch):
+    monkeypatch.setattr(api, "plan_store", PlanStore(""))
+    result = client.post("/api/calculate", json=sample_request).json()
+
+    assert result["plan_id"]
+    assert client.get(f"/api/plans/{result['plan_id']}").status_code == 404
+
+
+def test_server_timing_header(sample_request):
+    timed = TestClient(ServerTimingMiddleware(app))
+    response = timed.post("/api/calculate", json=sample_request)
+    assert response.status_code == 200
+    timings = parse_server_timing(response.headers["server-timing"])
+    for name in ("parse", "store", "solve", "stats", "validate", "encode"):
+        assert name in timings
+    assert (
+        timings["total"]
+        >= sum(ms for name, ms in timings.items() if name != "total") - 0.01
+    )
+
+    # Off unless enabled
+    untimed = client.post("/api/calculate", json=sample_request)
+    assert "server-timing" not in untimed.headers
+
+
+def test_profile_request(sample_request, monkeypatch):
+    monkeypatch.setattr(api, "plan_store", PlanStore(""))
+    body = json.dumps(sample_request).encode()
+    samples = profile_request(app, "/api/calculate", body, runs=3)
+
+    # Nothing is stored between runs, so each one solves the request
+    assert len(samples["solve"]) == 3
+    assert len(samples["total"]) == 3
+    with pytest.raises(ValueError, match="404"):
+        profile_request(app, "/api/missing", body, runs=1)
+
+
+def test_sweep(sample_request):
+    response = client.post(
+        "/api/sweep",
+        json={**sample_request, "grid": {"wood_types.pine 5x10.price": [50, 40]}},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [scenario["total_cost"] for scenario in data["scenarios"]] == [100, 80]
+    assert data["solves"] == 1
+
+
+def test_pack_stream(sample_request):
+    lines = [
+        {"settings": sample_request["settings"]},
+        {"type": "pine 5x10", "length": 250},
+        {"type": "pine 5x10", "length": 229.7},
+        {"type": "pine 5x10", "length": 100},
+    ]
+    body = "\n".join(json.dumps(line) for line in lines) + "\n"
+
+    response = client.post("/api/pack/stream", content=body)
+
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["event"] for event in events] == ["board", "board", "summary"]
+    assert events[0]["reason"] == "full"
+    assert events[1]["reason"] == "flush"
+    assert events[2]["total_units"] == {"pine 5x10": 2}
+
+
+def test_pack_stream_requires_settings():
+    response = client.post("/api/pack/stream", content='{"type": "pine 5x10"}\n')
+    assert response.status_code == 400
@@ -0,0 +1,94 @@
+import struct
+
+import pytest
+from woodcut_planner.binary_format import read_binary_pieces, write_binary_pieces
+from woodcut_planner.loaders import load_piece_counts, load_pieces
+from woodcut_planner.models import WoodPiece
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "pieces.wcb"
+    piece_counts = {
+        "pine 5x10": {250.0: 2, 180.5: 1},
+        "oak 4x8 ü": {200.0: 7},
+    }
+
+    assert write_binary_pieces(piece_counts, path) == 3
+    assert read_binary_pieces(path) == piece_counts
+
+
+def test_load_pieces_reads_binary(tmp_path):
+    path = tmp_path / "pieces.wcb"
+    write_binary_pieces({"pine 5x10": {250.0: 2}}, path)
+
+    assert load_pieces(path) == [WoodPiece(type="pine 5x10", length=250, count=2)]
+
+
+def test_load_piece_counts_groups_any_format(tmp_path):
+    binary = tmp_path / "pieces.wcb"
+    write_binary_pieces({"pine 5x10": {250.0: 2}}, binary)
+    lines = tmp_path / "pieces.jsonl"
+    lines.write_text('{"type": "pine 5x10", "length": 250, "count": 2}\n')
+
+    assert load_piece_counts(binary) == {"pine 5x10": {250.0: 2}}
+    assert load_piece_counts(lines) == {"pine 5x10": {250.0: 2}}
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "pieces.wcb"
+    path.write_bytes(b"type,length\n" + b"\0" * 32)
+
+    with pytest.raises(ValueError, match="not a binary cut list"):
+        read_binary_pieces(path)
+
+
+def test_rejects_truncated_and_invalid_records(tmp_path):
+    path = tmp_path / "pieces.wcb"
+    write_binary_pieces({"pine 5x10": {250.0: 2}}, path)
+    data = path.read_bytes()
+
+    path.write_bytes(data[:-1])
+    with pytest.raises(ValueError, match="truncated"):
+        read_binary_pieces(path)
+
+    path.write_bytes(data[:-8] + struct.pack("<d", -1.0))
+    with pytest.raises(ValueError, match="invalid pine 5x10 piece"):
+        read_binary_pieces(path)
+
+
+def test_rejects_dictionary_past_the_records(tmp_path):
+    path = tmp_path / "pieces.wcb"
+    # A bare header claiming 1000 wood types and no records
+    path.write_bytes(struct.pack("<4sHHIQQ", b"WCUT", 1, 0, 1000, 28, 0))
+
+    with pytest.raises(ValueError, match="dictionary overlaps the records"):
+        read_binary_pieces(path)
+
+
+def test_rejects_duplicate_type_names(tmp_path):
+    path = tmp_path / "pieces.wcb"
+    name = _name_entry("pine 5x10")
+    path.write_bytes(
+        struct.pack("<4sHHIQQ", b"WCUT", 2, 0, 2, 56, 0) + name + name + b"\0" * 6
+    )
+
+    with pytest.raises(ValueError, match="lists a name twice"):
+        read_binary_pieces(path)
+
+
+def test_reads_version_1_records(tmp_path):
+    path = tmp_path / "pieces.wcb"
+    records = struct.pack("<IId", 0, 2, 250.0) + struct.pack("<IId", 0, 1, 250.0)
+    path.write_bytes(
+        struct.pack("<4sHHIQQ", b"WCUT", 1, 0, 1, 40, 2)
+        + _name_entry("pine 5x10")
+        + b"\0"
+        + records
+    )
+
+    assert read_binary_pieces(path) == {"pine 5x10": {250.0: 3}}
+
+
+def _name_entry(name):
+    encoded = name.encode()
+    return struct.pack("<H", len(encoded)) + encoded
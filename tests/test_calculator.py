@@ -0,0 +1,138 @@
+import random
+import time
+from functools import partial
+
+import pytest
+from woodcut_planner.calculator import calculate_wood_arrangement
+from woodcut_planner.models import WoodPiece
+
+
+@pytest.fixture
+def small_settings(make_settings):
+    """Settings for a 10cm unit and no saw width, where lengths add up exactly."""
+    return partial(make_settings, unit_length=10, saw_width=0)
+
+
+def placed_lengths(result):
+    return sorted(
+        pos.length
+        for arr in result.arrangements
+        for unit in arr.units
+        for pos in unit.positions
+    )
+
+
+def test_subset_sum_fills_units_closer_than_ffd(small_settings):
+    pieces = [WoodPiece(type="pine 5x10", length=length) for length in (6, 5, 4, 3, 2)]
+
+    ffd = calculate_wood_arrangement(pieces, small_settings())
+    subset_sum = calculate_wood_arrangement(
+        pieces, small_settings(packing_strategy="subset_sum")
+    )
+
+    assert ffd.total_units["pine 5x10"] == 3
+    assert subset_sum.total_units["pine 5x10"] == 2
+    assert placed_lengths(subset_sum) == [2, 3, 4, 5, 6]
+
+
+def test_subset_sum_accounts_for_saw_width(make_settings):
+    settings = make_settings(packing_strategy="subset_sum")
+    pieces = [WoodPiece(type="pine 5x10", length=160, count=3)]
+
+    result = calculate_wood_arrangement(pieces, settings)
+
+    # 3 x 160cm plus two saw cuts is 480.6cm, so only two fit per unit
+    assert result.total_units["pine 5x10"] == 2
+    for unit in result.arrangements[0].units:
+        end = max(pos.start_position + pos.length for pos in unit.positions)
+        assert end <= 480
+        assert unit.waste == pytest.approx(480 - end)
+
+
+def test_subset_sum_handles_large_orders(make_settings):
+    settings = make_settings(packing_strategy="subset_sum")
+    pieces = [
+        WoodPiece(type="pine 5x10", length=length, count=250)
+        for length in (250, 180, 120.5, 90, 45.2, 30, 12)
+    ]
+
+    start = time.perf_counter()
+    result = calculate_wood_arrangement(pieces, settings)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 5
+    assert len(placed_lengths(result)) == 7 * 250
+
+
+@pytest.mark.parametrize("distinct, decimals", [(150, 3), (3000, 3), (3000, 1)])
+def test_subset_sum_bounded_on_many_distinct_lengths(distinct, decimals, make_settings):
+    rng = random.Random(distinct + decimals)
+    settings = make_settings(packing_strategy="subset_sum")
+    lengths = [round(rng.uniform(10, 200), decimals) for _ in range(distinct)]
+    pieces = [
+        WoodPiece(type="pine 5x10", length=rng.choice(lengths)) for _ in range(3000)
+    ]
+
+    start = time.perf_counter()
+    result = calculate_wood_arrangement(pieces, settings)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 5
+    assert placed_lengths(result) == sorted(piece.length for piece in pieces)
+    for unit in result.arrangements[0].units:
+        end = max(pos.start_position + pos.length for pos in unit.positions)
+        assert end <= 480 + 1e-9
+
+
+def test_subset_sum_rejects_pieces_longer_than_unit(small_settings):
+    pieces = [WoodPiece(type="pine 5x10", length=11)]
+
+    with pytest.raises(ValueError, match="too long"):
+        calculate_wood_arrangement(
+            pieces, small_settings(packing_strategy="subset_sum")
+        )
+
+
+def test_improvement_pass_saves_units(small_settings):
+    pieces = [WoodPiece(type="pine 5x10", length=length) for length in (6, 5, 4, 3, 2)]
+
+    result = calculate_wood_arrangement(
+        pieces, small_settings(improvement_time_limit=1)
+    )
+
+    assert result.total_units["pine 5x10"] == 2
+    assert result.units_saved == {"pine 5x10": 1}
+    assert placed_lengths(result) == [2, 3, 4, 5, 6]
+    assert [unit.unit_number for unit in result.arrangements[0].units] == [1, 2]
+
+
+def test_improvement_pass_respects_iteration_limit(small_settings):
+    pieces = [WoodPiece(type="pine 5x10", length=length) for length in (6, 5, 4, 3, 2)]
+
+    result = calculate_wood_arrangement(
+        pieces,
+        small_settings(improvement_time_limit=1, improvement_max_iterations=0),
+    )
+
+    assert result.total_units["pine 5x10"] == 3
+    assert result.units_saved == {"pine 5x10": 0}
+
+
+def test_diagnostics_count_fit_attempts(small_settings):
+    pieces = [WoodPiece(type="pine 5x10", length=length) for length in (6, 5, 4, 3, 2)]
+
+    assert calculate_wood_arrangement(pieces, small_settings()).diagnostics is None
+
+    result = calculate_wood_arrangement(
+        pieces, small_settings(collect_diagnostics=True)
+    )
+
+    stats = result.diagnostics.by_type["pine 5x10"]
+    assert stats.pieces == 5
+    assert stats.units_opened == result.total_units["pine 5x10"] == 3
+    # Every piece after the first tries the emptiest unit once
+    assert stats.units_scanned == 4
+    assert stats.max_units_scanned == 1
+    assert stats.fit_attempts == stats.units_scanned + stats.units_opened
+    assert stats.failed_fits == stats.units_opened - 1
+    assert result.diagnostics.total_seconds >= stats.pack_seconds
@@ -0,0 +1,47 @@
+import pytest
+from woodcut_planner.calculator import calculate_wood_arrangement
+from woodcut_planner.columnar_exporter import SCHEMAS, export_tables, generate_columns
+from woodcut_planner.models import WoodPiece
+
+
+@pytest.fixture
+def result(settings):
+    pieces = [
+        WoodPiece(type="pine 5x10", length=250, count=2),
+        WoodPiece(type="pine 5x10", length=180, count=1),
+    ]
+    return calculate_wood_arrangement(pieces, settings)
+
+
+def test_generate_columns_flattens_result(result, settings):
+    tables = generate_columns(result, settings)
+
+    assert set(tables) == set(SCHEMAS)
+    for table, columns in tables.items():
+        assert list(columns) == [name for name, _ in SCHEMAS[table]]
+        assert len({len(values) for values in columns.values()}) == 1
+
+    units = tables["units"]
+    assert units["unit_number"] == [1, 2]
+    assert units["capacity"] == [480, 480]
+    assert sum(units["piece_count"]) == 3
+    assert sorted(tables["placements"]["length"]) == [180, 250, 250]
+    assert tables["waste"]["units"] == [2]
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_export_tables_round_trip(result, settings, tmp_path, fmt):
+    pa = pytest.importorskip("pyarrow")
+
+    paths = export_tables(result, settings, tmp_path, fmt)
+
+    units_path = tmp_path / f"units.{fmt}"
+    assert units_path in paths
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(units_path)
+    else:
+        table = pa.ipc.open_file(pa.memory_map(str(units_path))).read_all()
+    assert table.schema.field("unit_number").type == pa.int32()
+    assert table.column("unit_number").to_pylist() == [1, 2]
@@ -0,0 +1,66 @@
+import pytest
+from woodcut_planner.consolidation import calculate_consolidated_arrangement
+from woodcut_planner.models import Project, WoodPiece
+
+
+def test_projects_share_units(settings):
+    projects = [
+        Project(name="shed", pieces=[WoodPiece(type="pine 5x10", length=250)]),
+        Project(name="deck", pieces=[WoodPiece(type="pine 5x10", length=100, count=2)]),
+    ]
+
+    consolidated = calculate_consolidated_arrangement(projects, settings)
+
+    assert consolidated.result.total_units == {"pine 5x10": 1}
+    shed, deck = consolidated.projects["shed"], consolidated.projects["deck"]
+    assert shed.pieces == 1 and deck.pieces == 2
+    assert shed.units["pine 5x10"] == pytest.approx(250 / 450)
+    assert shed.total_cost + deck.total_cost == pytest.approx(50)
+
+
+def test_every_placement_is_attributed(settings):
+    projects = [
+        Project(
+            name=f"job {i}",
+            pieces=[WoodPiece(type="pine 5x10", length=length, count=3)],
+        )
+        for i, length in enumerate((120, 120, 90.5, 200))
+    ]
+
+    consolidated = calculate_consolidated_arrangement(projects, settings)
+
+    placed = {}
+    for unit in consolidated.result.arrangements[0].units:
+        for position in unit.positions:
+            placed.setdefault(position.project, []).append(position.length)
+    assert placed == {
+        "job 0": [120] * 3,
+        "job 1": [120] * 3,
+        "job 2": [90.5] * 3,
+        "job 3": [200] * 3,
+    }
+    total = sum(share.total_cost for share in consolidated.projects.values())
+    assert total == pytest.approx(consolidated.result.total_cost)
+
+
+def test_identical_projects_get_equal_shares(settings):
+    pieces = [
+        WoodPiece(type="pine 5x10", length=length, count=count)
+        for length, count in ((250, 3), (180, 5), (120.5, 4), (90, 7), (45.2, 6))
+    ]
+    projects = [Project(name=name, pieces=pieces) for name in ("a", "b", "c")]
+
+    consolidated = calculate_consolidated_arrangement(projects, settings)
+
+    a, b, c = (consolidated.projects[name] for name in "abc")
+    for other in (b, c):
+        assert other.total_cost == pytest.approx(a.total_cost)
+        assert other.units == pytest.approx(a.units)
+    assert 3 * a.total_cost == pytest.approx(consolidated.result.total_cost)
+
+
+def test_duplicate_project_names_rejected(settings):
+    project = Project(name="shed", pieces=[WoodPiece(type="pine 5x10", length=10)])
+
+    with pytest.raises(ValueError, match="Duplicate project names"):
+        calculate_consolidated_arrangement([project, project], settings)
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+from woodcut_planner.loaders import load_pieces
+from woodcut_planner.models import WoodPiece
+
+
+def test_load_csv_merges_duplicate_lines(tmp_path):
+    path = tmp_path / "pieces.csv"
+    path.write_text(
+        "type,length,count\n"
+        "pine 5x10,250,2\n"
+        "pine 5x10,180,\n"
+        "pine 5x10,250,3\n"
+        "oak 4x8,200,1\n"
+    )
+
+    assert load_pieces(path) == [
+        WoodPiece(type="pine 5x10", length=250, count=5),
+        WoodPiece(type="pine 5x10", length=180, count=1),
+        WoodPiece(type="oak 4x8", length=200, count=1),
+    ]
+
+
+def test_load_csv_skips_byte_order_mark(tmp_path):
+    path = tmp_path / "pieces.csv"
+    path.write_text("\ufefftype,length,count\npine 5x10,250,2\n", encoding="utf-8")
+
+    assert load_pieces(path) == [WoodPiece(type="pine 5x10", length=250, count=2)]
+
+
+def test_load_json_lines_merges_duplicate_lines(tmp_path):
+    path = tmp_path / "pieces.jsonl"
+    records = [
+        {"type": "pine 5x10", "length": 250},
+        {"type": "pine 5x10", "length": 250, "count": 4},
+    ]
+    path.write_text("\n".join(json.dumps(record) for record in records) + "\n")
+
+    assert load_pieces(path) == [WoodPiece(type="pine 5x10", length=250, count=5)]
+
+
+def test_load_reports_line_numbers(tmp_path):
+    path = tmp_path / "pieces.jsonl"
+    path.write_text(
+        '{"type": "pine 5x10", "length": 250}\n'
+        "\n"
+        '{"type": "pine 5x10", "length": -1}\n'
+        "{not json\n"
+    )
+
+    with pytest.raises(ValueError) as excinfo:
+        load_pieces(path)
+
+    message = str(excinfo.value)
+    assert "line 3: length: Input should be greater than 0" in message
+    assert "line 4: invalid JSON" in message
+    assert "line 1" not in message
+
+
+@pytest.mark.parametrize("other_line", ['{"type": "a", "length": 1}', "{not json"])
+def test_load_json_lines_rejects_two_objects_on_one_line(tmp_path, other_line):
+    path = tmp_path / "pieces.jsonl"
+    path.write_text(
+        '{"type": "a", "length": 2},{"type": "a", "length": 3}\n' + other_line + "\n"
+    )
+
+    # The line is invalid whether or not the rest of its batch is
+    with pytest.raises(ValueError, match="line 1: invalid JSON: Extra data"):
+        load_pieces(path)
+
+
+def test_load_json_array_keeps_existing_format(tmp_path):
+    path = tmp_path / "pieces.json"
+    path.write_text(json.dumps([{"type": "oak 4x8", "length": 150, "count": 3}]))
+
+    assert load_pieces(path) == [WoodPiece(type="oak 4x8", length=150, count=3)]
@@ -0,0 +1,71 @@
+import pytest
+from woodcut_planner.models import WoodPiece
+from woodcut_planner.online import OnlinePacker
+
+
+@pytest.fixture
+def settings(make_settings):
+    return make_settings(unit_length=10, saw_width=0)
+
+
+def piece(length, count=1):
+    return WoodPiece(type="pine 5x10", length=length, count=count)
+
+
+def test_full_units_are_finished_right_away(settings):
+    packer = OnlinePacker(settings)
+
+    assert packer.add(piece(6)) == []
+    boards = packer.add(piece(4))
+
+    assert [board.reason for board in boards] == ["full"]
+    assert boards[0].unit.pieces == {6: 1, 4: 1}
+    assert packer.open_units() == 0
+
+
+def test_window_overflow_finishes_fullest_unit(settings):
+    packer = OnlinePacker(settings, window=2)
+
+    assert packer.add(piece(7, count=2)) == []
+    boards = packer.add(piece(5))
+
+    assert [board.reason for board in boards] == ["window"]
+    assert boards[0].unit.unit_number == 1
+    assert packer.open_units() == 2
+
+
+def test_best_fit_and_flush(settings):
+    packer = OnlinePacker(settings, min_length=2)
+    packer.add(piece(5))
+    packer.add(piece(7))
+
+    # 3 fits both open units; the tighter one (7) is finished as full
+    boards = packer.add(piece(3))
+    assert boards[0].unit.pieces == {7: 1, 3: 1}
+
+    boards = packer.flush()
+    assert [board.reason for board in boards] == ["flush"]
+    assert packer.summary()["total_units"] == {"pine 5x10": 2}
+
+
+def test_handle_line_reports_errors(settings):
+    packer = OnlinePacker(settings)
+
+    events = packer.handle_line('{"type": "oak", "length": 5}', 3)
+    assert events == [{"event": "error", "line": 3, "detail": "Unknown wood type: oak"}]
+    assert packer.handle_line('{"type": "pine 5x10", "length": 12}', 4)[0]["event"] == (
+        "error"
+    )
+    assert packer.handle_line('{"command": "flush"}', 5) == []
+
+
+@pytest.mark.parametrize("wood_type", ['["x"]', "5", '"oak"'])
+def test_flush_of_unknown_type_reports_error(settings, wood_type):
+    packer = OnlinePacker(settings)
+    packer.add(piece(4))
+
+    events = packer.handle_line(f'{{"command": "flush", "type": {wood_type}}}', 2)
+
+    assert [event["event"] for event in events] == ["error"]
+    assert "Unknown wood type" in events[0]["detail"]
+    assert packer.open_units() == 1
@@ -0,0 +1,40 @@
+import pytest
+from woodcut_planner.calculator import calculate_wood_arrangement
+from woodcut_planner.models import WoodPiece
+from woodcut_planner.report import render_report
+
+
+@pytest.fixture
+def result(settings):
+    pieces = [
+        WoodPiece(type="pine 5x10", length=150, count=60),
+        WoodPiece(type="pine 5x10", length=170, count=30),
+    ]
+    return calculate_wood_arrangement(pieces, settings)
+
+
+def test_full_report_lists_units_up_to_limit(result, settings):
+    units = result.total_units["pine 5x10"]
+
+    report = render_report(result, settings, limit=2)
+
+    assert "  Unit 2\n" in report
+    assert "  Unit 3\n" not in report
+    assert f"... {units - 2} more units" in report
+    assert "Order Summary" in report
+
+
+def test_patterns_report_groups_identical_units(result, settings):
+    report = render_report(result, settings, mode="patterns")
+
+    assert "20x unit: 3x 150.0cm" in report
+    assert "15x unit: 2x 170.0cm" in report
+    assert "Unit 1" not in report
+
+
+def test_summary_report_skips_units(result, settings):
+    report = render_report(result, settings, mode="summary")
+
+    assert "Wood Type: pine 5x10" not in report
+    assert "Order Summary" in report
+    assert report.endswith("=" * 50)
@@ -0,0 +1,70 @@
+from functools import partial
+
+import pytest
+from woodcut_planner.models import SheetPiece
+from woodcut_planner.sheet_calculator import calculate_sheet_arrangement
+
+
+@pytest.fixture
+def sheet_settings(make_settings):
+    """Settings with plywood sheets only, by default without saw width."""
+    return partial(
+        make_settings,
+        wood_types={},
+        sheet_types={"plywood 18mm": {"width": 244, "height": 122, "price": 40}},
+        saw_width=0,
+    )
+
+
+def test_quarter_sheets_fill_one_sheet(sheet_settings):
+    pieces = [SheetPiece(type="plywood 18mm", width=122, height=61, count=4)]
+
+    result = calculate_sheet_arrangement(pieces, sheet_settings())
+
+    assert result.total_units == {"plywood 18mm": 1}
+    assert result.total_cost == 40
+    assert result.sheet_arrangements[0].units[0].pieces == {"122x61": 4}
+    assert result.waste_statistics.total_waste == pytest.approx(0)
+
+
+def test_rotation_can_be_disabled(sheet_settings):
+    rotated = [SheetPiece(type="plywood 18mm", width=122, height=244)]
+    fixed = [SheetPiece(type="plywood 18mm", width=122, height=244, rotatable=False)]
+
+    result = calculate_sheet_arrangement(rotated, sheet_settings())
+    assert result.sheet_arrangements[0].units[0].placements[0].rotated
+
+    with pytest.raises(ValueError, match="too large"):
+        calculate_sheet_arrangement(fixed, sheet_settings())
+
+
+def test_placements_stay_on_sheet_and_leave_saw_width(sheet_settings):
+    saw_width = 0.3
+    pieces = [
+        SheetPiece(type="plywood 18mm", width=width, height=height, count=3)
+        for width, height in ((80, 40), (60, 60), (120, 30), (45.5, 20), (100, 100))
+    ]
+
+    result = calculate_sheet_arrangement(pieces, sheet_settings(saw_width=saw_width))
+
+    placed = 0
+    for unit in result.sheet_arrangements[0].units:
+        for i, a in enumerate(unit.placements):
+            assert a.x + a.width <= 244 + 1e-9
+            assert a.y + a.height <= 122 + 1e-9
+            for b in unit.placements[i + 1 :]:
+                assert (
+                    a.x + a.width + saw_width <= b.x + 1e-9
+                    or b.x + b.width + saw_width <= a.x + 1e-9
+                    or a.y + a.height + saw_width <= b.y + 1e-9
+                    or b.y + b.height + saw_width <= a.y + 1e-9
+                )
+        placed += len(unit.placements)
+    assert placed == 15
+
+
+def test_unknown_sheet_type(sheet_settings):
+    pieces = [SheetPiece(type="mdf", width=10, height=10)]
+
+    with pytest.raises(ValueError, match="Unknown sheet type"):
+        calculate_sheet_arrangement(pieces, sheet_settings())
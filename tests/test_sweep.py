@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from woodcut_planner.calculator import calculate_wood_arrangement, group_pieces
+from woodcut_planner.models import WoodPiece, SettingsVariant
+from woodcut_planner.sweep import apply_overrides, expand_grid, run_sweep
+
+
+@pytest.fixture
+def pieces():
+    return [
+        WoodPiece(type="pine 5x10", length=250, count=4),
+        WoodPiece(type="pine 5x10", length=150, count=6),
+    ]
+
+
+def test_sweep_matches_independent_solves(settings, pieces):
+    variants = expand_grid(
+        {"saw_width": [0.3, 0.5], "wood_types.pine 5x10.unit_length": [480, 420]}
+    )
+
+    result = run_sweep(group_pieces(pieces), settings, variants, workers=2)
+
+    assert len(result.scenarios) == 4
+    for variant, scenario in zip(variants, result.scenarios):
+        expected = calculate_wood_arrangement(
+            pieces, apply_overrides(settings, variant.overrides)
+        )
+        assert scenario.name == variant.name
+        assert scenario.total_units == expected.total_units
+        assert scenario.total_cost == expected.total_cost
+
+
+def test_sweep_uses_a_shared_executor(settings, pieces):
+    variants = expand_grid({"saw_width": [0.3, 0.5]})
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        shared = run_sweep(group_pieces(pieces), settings, variants, executor=executor)
+    alone = run_sweep(group_pieces(pieces), settings, variants, workers=1)
+
+    assert shared == alone
+
+
+def test_price_only_variants_share_one_packing(settings, pieces):
+    variants = [
+        SettingsVariant(name="supplier A", overrides={}),
+        SettingsVariant(
+            name="supplier B", overrides={"wood_types.pine 5x10.price": 40}
+        ),
+    ]
+
+    result = run_sweep(group_pieces(pieces), settings, variants, workers=1)
+
+    assert result.solves == 1
+    a, b = result.scenarios
+    assert a.units == b.units
+    assert b.total_cost == pytest.approx(a.total_cost * 40 / 50)
+
+
+def test_invalid_override(settings, pieces):
+    with pytest.raises(ValueError, match="Unknown wood type"):
+        run_sweep(
+            group_pieces(pieces),
+            settings,
+            [SettingsVariant(overrides={"wood_types.oak.price": 1})],
+        )
+    with pytest.raises(ValueError):
+        run_sweep(
+            group_pieces(pieces),
+            settings,
+            [SettingsVariant(overrides={"saw_width": -1})],
+        )